@@ -1,16 +1,13 @@
-from langchain_openai import ChatOpenAI
+from typing import Optional
 from langchain_core.documents import Document
-from utils.config import (
-    HUGGINGFACE_API_KEY, 
-    HUGGINGFACE_API_BASE, 
-    LLAMA_MODEL_NAME, 
-    DEFAULT_TEMPERATURE, 
-    DEFAULT_MAX_TOKENS,
-    validate_config
-)
-from tools.web_search import web_search
-from chains.summary import summarize_documents
+from utils.config import validate_config
+from utils.llm_pool import get_llm_pool
+from tools.web_search import run_search, search_web
+from chains.summary import summarize_documents, summarize_items
 from utils.logger import get_logger
+from utils.serialization import dumps, loads
+from utils.store import content_key, get_store
+from utils.timing import StageTimer, timed
 
 # Get logger for this module
 logger = get_logger("agents.research")
@@ -19,20 +16,28 @@ logger = get_logger("agents.research")
 validate_config()
 logger.info("✅ Configuration validated successfully")
 
-# Instantiate the Llama 3.3 70B LLM with HuggingFace API
-llm = ChatOpenAI(
-    model=LLAMA_MODEL_NAME,
-    temperature=DEFAULT_TEMPERATURE,
-    max_tokens=DEFAULT_MAX_TOKENS,
-    base_url=HUGGINGFACE_API_BASE,
-    api_key=HUGGINGFACE_API_KEY
-)
+# Llama 3.3 70B via the shared pool of OpenAI-compatible backends
+llm = get_llm_pool()
 
 # Note: Llama 3.3 70B via HuggingFace doesn't support native tool calling
 # So we use a simpler approach: always search and then summarize
 
+# Number of results returned per query
+TOP_RESULTS = 5
 
-def research_with_summary(query: str) -> str:
+
+def _record_run(query: str, items: list, result_data: dict, mode: str, reused: int = 0, new_summaries: dict = None):
+    """Save a run to the research store, never failing the request over it"""
+    store = get_store()
+    if store is None:
+        return
+    try:
+        store.record_run(query, items, result_data, mode=mode, reused=reused, new_summaries=new_summaries)
+    except Exception as e:
+        logger.error(f"❌ Failed to store research run: {e}", exc_info=True)
+
+
+def research_with_summary(query: str, timer: Optional[StageTimer] = None) -> str:
     """
     High-level function to perform web search and summarize the results.
     
@@ -41,6 +46,7 @@ def research_with_summary(query: str) -> str:
     
     Args:
         query: The research query from the user
+        timer: Optional StageTimer that receives per-stage timings
         
     Returns:
         str: JSON formatted string with top 5 search results and their summaries
@@ -51,7 +57,8 @@ def research_with_summary(query: str) -> str:
     
     # Step 1: Perform web search
     logger.info("🔍 Calling web search tool...")
-    search_results = web_search.invoke(query)
+    with timed(timer, "search"):
+        items, search_results = run_search(query)
     logger.info(f"✅ Search completed: {len(search_results)} characters retrieved")
     
     # Step 2: Wrap the search results as a LangChain Document for summarization
@@ -60,10 +67,99 @@ def research_with_summary(query: str) -> str:
     
     # Step 3: Summarize the search results into JSON format with top 5 results
     logger.info("📊 Generating JSON summary...")
-    summary = summarize_documents(docs)
+    with timed(timer, "summarize"):
+        summary = summarize_documents(docs)
+    
+    # Step 4: Keep the run (and its per-URL summaries) for history and refreshes
+    if items:
+        try:
+            result_data = loads(summary)
+        except ValueError:
+            logger.warning("Summary is not valid JSON, run not stored")
+        else:
+            with timed(timer, "store"):
+                _record_run(query, items, result_data, "full")
     
     logger.info("=" * 80)
     logger.info("🎉 Research process completed successfully!")
     logger.info("=" * 80)
     
-    return summary
\ No newline at end of file
+    return summary
+
+
+def assemble_results(items: list, summaries: dict) -> dict:
+    """
+    Build the response payload from search results and per-URL summaries.
+    
+    Args:
+        items: SearchResult records in rank order
+        summaries: Mapping of URL to summary
+        
+    Returns:
+        dict: {"results": [...]} with the top results, ranked from 1
+    """
+    return {
+        "results": [
+            {
+                "rank": rank,
+                "title": item.title,
+                "url": item.link,
+                "summary": summaries[item.link]
+            }
+            for rank, item in enumerate(items[:TOP_RESULTS], 1)
+        ]
+    }
+
+
+def refresh_research(query: str, timer: Optional[StageTimer] = None) -> str:
+    """
+    Re-run a query, only summarizing results that are new or have changed.
+    
+    The search is always repeated, but a result whose URL and snippet match a
+    stored summary reuses that summary instead of going back to the LLM. For
+    recurring queries most of the top results are unchanged between runs, so
+    this usually needs a much smaller LLM call (or none at all).
+    
+    Args:
+        query: The research query to refresh
+        timer: Optional StageTimer that receives per-stage timings
+        
+    Returns:
+        str: JSON formatted string with the top search results and their summaries
+    """
+    logger.info("=" * 80)
+    logger.info(f"🔄 Incremental refresh started for query: '{query}'")
+    logger.info("=" * 80)
+    
+    with timed(timer, "search"):
+        items = search_web(query)[:TOP_RESULTS]
+    if not items:
+        logger.warning("No results found for the query")
+        return dumps({"results": []}).decode("utf-8")
+    
+    store = get_store()
+    keys = {item.link: content_key(item.link, item.snippet) for item in items}
+    with timed(timer, "store"):
+        stored = store.get_summaries(keys.values()) if store is not None else {}
+    summaries = {url: stored[key] for url, key in keys.items() if key in stored}
+    
+    # One item per URL (the last, matching `keys`), as summarize_items requires
+    changed = list({item.link: item for item in items if item.link not in summaries}.values())
+    logger.info(f"♻️ Reusing {len(summaries)} stored summaries, summarizing {len(changed)} new/changed result(s)")
+    reused = len(summaries)
+    new_summaries = {}
+    if changed:
+        with timed(timer, "summarize"):
+            fresh = summarize_items(changed)
+        new_summaries = {item.link: fresh[keys[item.link]] for item in changed if keys[item.link] in fresh}
+        summaries.update(new_summaries)
+        # Results the model skipped show their snippet, but it isn't stored
+        # as their summary, so the next refresh asks the model again
+        summaries.update({item.link: item.snippet for item in changed if item.link not in new_summaries})
+    
+    result_data = assemble_results(items, summaries)
+    with timed(timer, "store"):
+        _record_run(query, items, result_data, "refresh", reused=reused, new_summaries=new_summaries)
+    
+    logger.info("🎉 Incremental refresh completed successfully!")
+    return dumps(result_data).decode("utf-8")
\ No newline at end of file
@@ -0,0 +1,259 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from agents.research import TOP_RESULTS, assemble_results
+from chains.summary import summarize_items
+from tools.results import results_from_dicts
+from tools.web_search import search_web
+from utils.config import (
+    WATCHLIST_TICK_SECONDS,
+    WATCHLIST_BATCH_SIZE,
+    WATCHLIST_SPREAD_SECONDS,
+    WATCHLIST_SEARCH_CONCURRENCY,
+    WATCHLIST_SEARCH_REUSE_SECONDS,
+    WATCHLIST_SUMMARY_BATCH_SIZE,
+    WATCHLIST_RETRY_SECONDS,
+    SERPAPI_MAX_PER_MINUTE,
+    LLM_MAX_PER_MINUTE
+)
+from utils.logger import get_logger
+from utils.rate_limit import RateLimiter
+from utils.store import ResearchStore, content_key
+
+# Get logger for this module
+logger = get_logger("agents.watchlist")
+
+
+def diff_results(previous: Optional[dict], current: dict) -> tuple:
+    """
+    Compare two result payloads by URL.
+    
+    Args:
+        previous: The earlier {"results": [...]} payload, or None for a first run
+        current: The new {"results": [...]} payload
+        
+    Returns:
+        tuple: (added, removed, changed) lists of result dicts
+    """
+    before = {r["url"]: r for r in (previous or {}).get("results", [])}
+    after = {r["url"]: r for r in current.get("results", [])}
+    added = [r for url, r in after.items() if url not in before]
+    removed = [r for url, r in before.items() if url not in after]
+    changed = [r for url, r in after.items() if url in before and before[url]["summary"] != r["summary"]]
+    return added, removed, changed
+
+
+class WatchlistScheduler:
+    """
+    Runs registered research queries on their intervals.
+    
+    Each tick takes the due queries as one batch: searches are spread out by a
+    SerpAPI rate limiter (or skipped when a recent search is stored), results
+    whose URL and snippet are unchanged reuse their stored summary, and the
+    remaining results from every query in the batch are deduplicated and
+    summarized together, several per LLM call.
+    
+    A watch whose search or summarization fails is retried with exponential
+    backoff (capped at its interval), reusing its search results in the
+    meantime so a flaky LLM does not spend SerpAPI quota.
+    """
+    
+    def __init__(
+        self,
+        store: ResearchStore,
+        batch_size: int = WATCHLIST_BATCH_SIZE,
+        tick_seconds: float = WATCHLIST_TICK_SECONDS,
+        search_concurrency: int = WATCHLIST_SEARCH_CONCURRENCY,
+        search_reuse_seconds: float = WATCHLIST_SEARCH_REUSE_SECONDS,
+        summary_batch_size: int = WATCHLIST_SUMMARY_BATCH_SIZE,
+        retry_seconds: float = WATCHLIST_RETRY_SECONDS,
+        search_limiter: Optional[RateLimiter] = None,
+        llm_limiter: Optional[RateLimiter] = None
+    ):
+        self.store = store
+        self.batch_size = batch_size
+        self.tick_seconds = tick_seconds
+        self.search_concurrency = search_concurrency
+        self.search_reuse_seconds = search_reuse_seconds
+        self.summary_batch_size = summary_batch_size
+        self.retry_seconds = retry_seconds
+        self.search_limiter = search_limiter or RateLimiter(SERPAPI_MAX_PER_MINUTE)
+        self.llm_limiter = llm_limiter or RateLimiter(LLM_MAX_PER_MINUTE)
+        self._task = None
+        # Searches for watches whose run has not been recorded yet, by watch id
+        self._unrecorded_searches = {}
+    
+    def add(self, query: str, interval_seconds: float) -> dict:
+        """Register a query, with a random first-run offset so new watches don't all fire together"""
+        next_run_at = time.time() + random.uniform(0, WATCHLIST_SPREAD_SECONDS)
+        watch = self.store.add_watch(query, interval_seconds, next_run_at)
+        logger.info(f"👀 Watching '{query}' every {interval_seconds:.0f}s (watch #{watch['id']})")
+        return watch
+    
+    def _search(self, watch: dict) -> list:
+        """Search for a watched query, reusing a recent search (stored, or from a failed run) if there is one"""
+        unrecorded = self._unrecorded_searches.get(watch["id"])
+        if unrecorded and time.time() - unrecorded[0] < self.search_reuse_seconds:
+            logger.debug(f"Reusing search results of the failed run for '{watch['query']}'")
+            return unrecorded[1]
+        latest = self.store.latest_run(watch["query"])
+        if latest and time.time() - latest["created_at"] < self.search_reuse_seconds:
+            logger.debug(f"Reusing stored search results for '{watch['query']}'")
+            return results_from_dicts(latest["search_results"][:TOP_RESULTS])
+        self.search_limiter.acquire()
+        items = search_web(watch["query"])[:TOP_RESULTS]
+        self._unrecorded_searches[watch["id"]] = (time.time(), items)
+        return items
+    
+    def _chunks(self, items: list) -> list:
+        """Split results into LLM calls of at most summary_batch_size, with each URL at most once per call"""
+        chunks = []
+        for item in items:
+            chunk = next(
+                (c for c in chunks if len(c) < self.summary_batch_size and all(i.link != item.link for i in c)),
+                None
+            )
+            if chunk is None:
+                chunk = []
+                chunks.append(chunk)
+            chunk.append(item)
+        return chunks
+    
+    def _summarize(self, items: list) -> tuple:
+        """
+        Summarize results in chunks, one rate-limited LLM call per chunk.
+        
+        Returns:
+            tuple: (summaries by content key, error message by content key for
+            results that could not be summarized)
+        """
+        summaries, failed = {}, {}
+        chunks = self._chunks(items)
+        for index, chunk in enumerate(chunks):
+            self.llm_limiter.acquire()
+            try:
+                summaries.update(summarize_items(chunk))
+            except Exception as e:
+                # The LLM is most likely unavailable, so don't spend calls on the rest
+                logger.error(f"❌ Summarization failed, skipping {len(chunks) - index} of {len(chunks)} chunk(s): {e}")
+                for item in (i for c in chunks[index:] for i in c):
+                    failed[content_key(item.link, item.snippet)] = f"Summarization failed: {e}"
+                break
+        return summaries, failed
+    
+    def _retry_at(self, watch: dict, now: float) -> float:
+        """When to retry a failed watch: exponential backoff, capped at the watch's interval"""
+        backoff = self.retry_seconds * 2 ** min(watch["consecutive_failures"], 16)
+        return now + min(backoff, watch["interval_seconds"])
+    
+    def run_due_batch(self, now: Optional[float] = None) -> int:
+        """
+        Run one batch of due watches.
+        
+        Args:
+            now: Unix timestamp to treat as the current time
+            
+        Returns:
+            int: Number of watches processed
+        """
+        now = now or time.time()
+        due = self.store.due_watches(now, self.batch_size)
+        if not due:
+            return 0
+        logger.info(f"⏰ Watchlist batch started: {len(due)} due quer{'y' if len(due) == 1 else 'ies'}")
+        
+        # Step 1: Search, spread out by the SerpAPI rate limiter
+        searched = {}
+        with ThreadPoolExecutor(max_workers=self.search_concurrency) as pool:
+            futures = {watch["id"]: pool.submit(self._search, watch) for watch in due}
+        for watch in due:
+            try:
+                searched[watch["id"]] = futures[watch["id"]].result()
+            except Exception as e:
+                logger.error(f"❌ Watch #{watch['id']} search failed: {e}")
+                self.store.mark_watch_run(watch["id"], self._retry_at(watch, now), error=str(e))
+        
+        # Step 2: Reuse stored summaries for unchanged results
+        keys = {
+            content_key(item.link, item.snippet): item
+            for items in searched.values() for item in items
+        }
+        stored = self.store.get_summaries(keys.keys())
+        
+        # Step 3: Summarize what's left from every query in the batch together
+        pending = [item for key, item in keys.items() if key not in stored]
+        logger.info(f"♻️ Batch reuses {len(stored)} stored summaries, summarizing {len(pending)} result(s)")
+        fresh, failed = self._summarize(pending) if pending else ({}, {})
+        
+        # Step 4: Store each query's run and what changed since its last one
+        for watch in due:
+            items = searched.get(watch["id"])
+            if items is None:
+                continue
+            keys = [content_key(item.link, item.snippet) for item in items]
+            errors = [failed[key] for key in keys if key in failed]
+            if errors:
+                retry_at = self._retry_at(watch, now)
+                logger.warning(f"⚠️ Watch #{watch['id']} not recorded, retrying in {retry_at - now:.0f}s")
+                self.store.mark_watch_run(watch["id"], retry_at, error=errors[0])
+                continue
+            # Results the model skipped show their snippet but aren't stored,
+            # so the next run asks the model for them again
+            new_summaries = {item.link: fresh[key] for item, key in zip(items, keys) if key in fresh}
+            skipped = sum(1 for key in keys if key not in stored and key not in fresh)
+            if skipped:
+                logger.warning(f"⚠️ Watch #{watch['id']}: {skipped} result(s) not summarized, using snippets")
+            summaries = {}
+            for item, key in zip(items, keys):
+                summaries[item.link] = stored.get(key) or fresh.get(key, item.snippet)
+            result_data = assemble_results(items, summaries)
+            reused = sum(1 for key in keys if key in stored)
+            
+            previous = self.store.get_run(watch["last_run_id"]) if watch["last_run_id"] else None
+            run_id = self.store.record_run(
+                watch["query"], items, result_data,
+                mode="watch", reused=reused, new_summaries=new_summaries
+            )
+            added, removed, changed = diff_results(previous["data"] if previous else None, result_data)
+            if added or removed or changed:
+                self.store.record_changes(watch["id"], run_id, added, removed, changed)
+                logger.info(f"🔔 '{watch['query']}': {len(added)} added, {len(removed)} removed, "
+                            f"{len(changed)} changed")
+            self.store.mark_watch_run(watch["id"], now + watch["interval_seconds"], run_id=run_id)
+            self._unrecorded_searches.pop(watch["id"], None)
+        
+        logger.info(f"✅ Watchlist batch completed: {len(due)} quer{'y' if len(due) == 1 else 'ies'}")
+        return len(due)
+    
+    async def _loop(self):
+        while True:
+            try:
+                # Keep draining while batches are full, otherwise wait for the next tick
+                processed = await asyncio.to_thread(self.run_due_batch)
+                if processed < self.batch_size:
+                    await asyncio.sleep(self.tick_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Watchlist batch failed: {e}", exc_info=True)
+                await asyncio.sleep(self.tick_seconds)
+    
+    def start(self):
+        """Start the scheduler loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+            logger.info(f"Watchlist scheduler started (tick {self.tick_seconds:.0f}s, batch {self.batch_size})")
+    
+    async def stop(self):
+        """Stop the scheduler loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Watchlist scheduler stopped")
@@ -1,17 +1,84 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import FastAPI, HTTPException, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from agents.research import research_with_summary
+from agents.research import research_with_summary, refresh_research
+from agents.watchlist import WatchlistScheduler
+from utils.admission import PRIORITIES, AdmissionController, Rejected, parse_api_key_priorities
+from utils.cache import TTLCache, normalize_query
+from utils.config import (
+    RESPONSE_COMPRESSION_MIN_SIZE,
+    RESULT_CACHE_TTL,
+    RESULT_CACHE_MAX_ENTRIES,
+    WATCHLIST_ENABLED,
+    WATCHLIST_MIN_INTERVAL,
+    ADMISSION_MAX_IN_FLIGHT,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_MAX_QUEUE_TIME_INTERACTIVE,
+    ADMISSION_MAX_QUEUE_TIME_BATCH,
+    ADMISSION_INITIAL_SERVICE_TIME,
+    ADMISSION_DEFAULT_PRIORITY,
+    ADMISSION_DEGRADED_RESPONSES,
+    API_KEY_PRIORITIES
+)
+from utils.llm_pool import get_llm_pool
 from utils.logger import get_logger
+from utils.serialization import dumps, loads, make_etag, etag_matches
+from utils.store import get_store
 import json
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
 # Get logger for API
 logger = get_logger("api")
 
+# Recurring research queries (needs the research store)
+store = get_store()
+scheduler = WatchlistScheduler(store) if store is not None else None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the watchlist scheduler with the app and stop it on shutdown"""
+    if scheduler is not None and WATCHLIST_ENABLED:
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Research Agent API",
     description="Web search and summarization agent using Llama 3.3 70B",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Compress responses above the size threshold (brotli if available, else gzip)
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_SIZE, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=RESPONSE_COMPRESSION_MIN_SIZE)
+
+# Serialized responses for recent queries, keyed by normalized query
+result_cache = TTLCache(max_entries=RESULT_CACHE_MAX_ENTRIES, ttl=RESULT_CACHE_TTL)
+
+# Admission control for research runs
+if ADMISSION_DEFAULT_PRIORITY not in PRIORITIES:
+    raise ValueError(f"ADMISSION_DEFAULT_PRIORITY must be one of: {', '.join(PRIORITIES)}")
+api_key_priorities = parse_api_key_priorities(API_KEY_PRIORITIES)
+admission = AdmissionController(
+    max_in_flight=ADMISSION_MAX_IN_FLIGHT,
+    max_queue=ADMISSION_MAX_QUEUE,
+    max_queue_time={
+        "interactive": ADMISSION_MAX_QUEUE_TIME_INTERACTIVE,
+        "batch": ADMISSION_MAX_QUEUE_TIME_BATCH
+    },
+    initial_service_time=ADMISSION_INITIAL_SERVICE_TIME
 )
 
 # Request/Response models
@@ -25,6 +92,18 @@ class ResearchQuery(BaseModel):
             }
         }
 
+class WatchRequest(BaseModel):
+    query: str
+    interval_seconds: float = 3600
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "new releases of popular Python web frameworks",
+                "interval_seconds": 3600
+            }
+        }
+
 class ResearchResponse(BaseModel):
     status: str
     data: dict
@@ -60,11 +139,138 @@ async def health_check():
     """Health check endpoint for monitoring"""
     return {"status": "healthy"}
 
+@app.get("/metrics/admission")
+async def admission_metrics():
+    """Admitted, queued and shed request counts plus queue times, for capacity planning"""
+    return admission.metrics()
+
+@app.get("/health/backends")
+async def backend_health():
+    """Health and latency statistics for each configured LLM backend"""
+    return {"backends": get_llm_pool().stats()}
+
+class CachedResult:
+    """A research response serialized once, with its ETag"""
+    __slots__ = ("body", "etag")
+    
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+
+def _json_response(cached: CachedResult, cache_status: str, headers: Optional[dict] = None) -> Response:
+    """
+    Send pre-serialized JSON bytes, skipping response_model re-validation.
+    
+    The ETag is weak because the compression middleware may re-encode the body.
+    """
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "X-Cache": cache_status, **(headers or {})}
+    )
+
+def _run_research(query: str, runner=research_with_summary) -> CachedResult:
+    """Run the research agent (or another runner) and cache the serialized response"""
+    # Call the research agent
+    result_json_str = runner(query)
+    
+    # Parse the JSON string to validate it
+    try:
+        result_data = loads(result_json_str)
+    except json.JSONDecodeError as e:
+        logger.error(f"Invalid JSON returned from research agent: {e}")
+        raise HTTPException(
+            status_code=500, 
+            detail="Failed to parse research results"
+        )
+    
+    # The payload is already known to be valid JSON, so serialize it once here
+    # instead of letting ResearchResponse re-validate and re-encode it
+    body = dumps({"status": "success", "data": result_data})
+    cached = CachedResult(body, make_etag(body))
+    result_cache.set(normalize_query(query), cached)
+    
+    logger.info("API request completed successfully")
+    return cached
+
+def _priority(request: Request) -> str:
+    """
+    Priority class of a request.
+    
+    A mapped X-API-Key decides the class. Otherwise X-Priority may lower the
+    priority below the default (e.g. 'batch'), but never raise it.
+    """
+    api_key = request.headers.get("X-API-Key")
+    if api_key in api_key_priorities:
+        return api_key_priorities[api_key]
+    requested = request.headers.get("X-Priority", "").strip().lower()
+    if requested in PRIORITIES and PRIORITIES[requested] >= PRIORITIES[ADMISSION_DEFAULT_PRIORITY]:
+        return requested
+    return ADMISSION_DEFAULT_PRIORITY
+
+async def _degraded_result(query: str) -> Optional[CachedResult]:
+    """
+    Best available stored answer for a query when the pipeline is saturated,
+    with status "degraded" whether it comes from the result cache or the store
+    """
+    cached = result_cache.get(normalize_query(query))
+    if cached is not None:
+        data = loads(cached.body)["data"]
+    elif store is not None:
+        latest = await run_in_threadpool(store.latest_run, query)
+        if latest is None:
+            return None
+        data = latest["data"]
+    else:
+        return None
+    body = dumps({"status": "degraded", "data": data})
+    return CachedResult(body, make_etag(body))
+
+async def _admitted_research(request: Request, query: str, runner=research_with_summary) -> tuple:
+    """
+    Run research under admission control.
+    
+    Returns:
+        tuple: (CachedResult, X-Cache value, extra response headers)
+        
+    Raises:
+        HTTPException: 429/503 with Retry-After if the request is shed and
+        no cached answer is available
+    """
+    logger.info(f"API request received for query: '{query}'")
+    
+    if not query.strip():
+        logger.warning("Empty query received")
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    
+    priority = _priority(request)
+    try:
+        async with admission.slot(priority) as queue_time:
+            # Run the blocking pipeline off the event loop so other requests keep flowing
+            cached = await run_in_threadpool(_run_research, query, runner)
+    except Rejected as e:
+        headers = {"Retry-After": str(e.retry_after)}
+        if ADMISSION_DEGRADED_RESPONSES:
+            degraded = await _degraded_result(query)
+            if degraded is not None:
+                admission.record_degraded()
+                logger.info(f"Serving cached result for '{query}' while overloaded ({e.reason})")
+                return degraded, "STALE", {**headers, "X-Degraded": e.reason}
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=f"Server overloaded ({e.reason}), retry later",
+            headers=headers
+        )
+    return cached, "MISS", {"X-Queue-Time": f"{queue_time:.3f}", "X-Priority": priority}
+
 @app.post("/research", response_model=ResearchResponse)
-async def research(query: ResearchQuery):
+async def research(query: ResearchQuery, request: Request):
     """
     Perform web research and return summarized results in JSON format.
     
+    Under overload the request may be shed with 429/503 and Retry-After, or
+    answered from cache with status "degraded" and an X-Degraded header.
+    
     Args:
         query: ResearchQuery object containing the search query
         
@@ -72,31 +278,67 @@ async def research(query: ResearchQuery):
         ResearchResponse with status and JSON data containing top 5 results
     """
     try:
-        logger.info(f"API request received for query: '{query.query}'")
+        return _json_response(*await _admitted_research(request, query.query))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"API error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/research", response_model=ResearchResponse)
+async def research_cached(
+    request: Request,
+    query: str = Query(..., description="The research query"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Return research results for a query, served from cache when available.
+    
+    Supports conditional requests: send the ETag from a previous response in
+    If-None-Match and a 304 Not Modified is returned if the result is unchanged.
+    
+    Args:
+        query: The research query
+        if_none_match: Optional ETag from a previous response
         
-        if not query.query.strip():
-            logger.warning("Empty query received")
-            raise HTTPException(status_code=400, detail="Query cannot be empty")
+    Returns:
+        ResearchResponse, or an empty 304 response if the client's copy is current
+    """
+    try:
+        cached = result_cache.get(normalize_query(query))
+        cache_status, headers = "HIT", {}
+        if cached is None:
+            cached, cache_status, headers = await _admitted_research(request, query)
         
-        # Call the research agent
-        result_json_str = research_with_summary(query.query)
+        if etag_matches(if_none_match, cached.etag):
+            return Response(status_code=304, headers={"ETag": cached.etag})
         
-        # Parse the JSON string to validate it
-        try:
-            result_data = json.loads(result_json_str)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON returned from research agent: {e}")
-            raise HTTPException(
-                status_code=500, 
-                detail="Failed to parse research results"
-            )
+        return _json_response(cached, cache_status, headers)
         
-        logger.info("API request completed successfully")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"API error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/research/refresh", response_model=ResearchResponse)
+async def research_refresh(query: ResearchQuery, request: Request):
+    """
+    Re-run a query incrementally, reusing stored summaries for unchanged results.
+    
+    Only search results that are new, or whose snippet changed since they were
+    last summarized, are sent to the LLM.
+    
+    Args:
+        query: ResearchQuery object containing the search query
         
-        return ResearchResponse(
-            status="success",
-            data=result_data
-        )
+    Returns:
+        ResearchResponse with status and JSON data containing top 5 results
+    """
+    try:
+        cached, cache_status, headers = await _admitted_research(request, query.query, runner=refresh_research)
+        return _json_response(cached, "REFRESH" if cache_status == "MISS" else cache_status, headers)
         
     except HTTPException:
         raise
@@ -104,6 +346,92 @@ async def research(query: ResearchQuery):
         logger.error(f"API error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/research/history")
+async def research_history(
+    query: Optional[str] = Query(None, description="Only runs for this query"),
+    since: Optional[float] = Query(None, description="Only runs at or after this Unix timestamp"),
+    limit: int = Query(50, ge=1, le=1000),
+    include_raw: bool = Query(False, description="Include raw search results")
+):
+    """
+    List stored research runs, newest first.
+    
+    Returns:
+        Dict with the matching runs
+    """
+    if store is None:
+        raise HTTPException(status_code=404, detail="Research store is disabled")
+    
+    runs = await run_in_threadpool(store.history, query=query, since=since, limit=limit, include_raw=include_raw)
+    return {"status": "success", "count": len(runs), "runs": runs}
+
+def _require_scheduler() -> WatchlistScheduler:
+    if scheduler is None:
+        raise HTTPException(status_code=404, detail="Watchlists need the research store, which is disabled")
+    return scheduler
+
+@app.post("/watchlist")
+async def add_watch(request: WatchRequest):
+    """
+    Register a query to be researched every `interval_seconds`.
+    
+    Registering a query that is already watched updates its interval.
+    
+    Returns:
+        Dict with the registered watch
+    """
+    watchlist = _require_scheduler()
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    if request.interval_seconds < WATCHLIST_MIN_INTERVAL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"interval_seconds must be at least {WATCHLIST_MIN_INTERVAL:.0f}"
+        )
+    watch = await run_in_threadpool(watchlist.add, request.query, request.interval_seconds)
+    return {"status": "success", "watch": watch}
+
+@app.get("/watchlist")
+async def list_watches():
+    """List all watched queries with their schedule and last run"""
+    watchlist = _require_scheduler()
+    watches = await run_in_threadpool(watchlist.store.list_watches)
+    return {"status": "success", "count": len(watches), "watches": watches}
+
+@app.get("/watchlist/changes")
+async def watch_changes(
+    watch_id: Optional[int] = Query(None, description="Only changes for this watch"),
+    since: Optional[float] = Query(None, description="Only changes at or after this Unix timestamp"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    List results that were added, removed or re-summarized between runs of watched queries.
+    
+    Returns:
+        Dict with the matching changes, newest first
+    """
+    watchlist = _require_scheduler()
+    changes = await run_in_threadpool(watchlist.store.changes, watch_id=watch_id, since=since, limit=limit)
+    return {"status": "success", "count": len(changes), "changes": changes}
+
+@app.get("/watchlist/{watch_id}")
+async def get_watch(watch_id: int):
+    """Return a watched query with the results of its latest run"""
+    watchlist = _require_scheduler()
+    watch = await run_in_threadpool(watchlist.store.get_watch, watch_id)
+    if watch is None:
+        raise HTTPException(status_code=404, detail="Watch not found")
+    run = await run_in_threadpool(watchlist.store.get_run, watch["last_run_id"]) if watch["last_run_id"] else None
+    return {"status": "success", "watch": watch, "data": run["data"] if run else None}
+
+@app.delete("/watchlist/{watch_id}")
+async def remove_watch(watch_id: int):
+    """Stop watching a query"""
+    watchlist = _require_scheduler()
+    if not await run_in_threadpool(watchlist.store.remove_watch, watch_id):
+        raise HTTPException(status_code=404, detail="Watch not found")
+    return {"status": "success"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Per-request memory benchmark of search ingestion
+Uses tracemalloc to compare the original ingestion path (full SerpAPI response,
+dict results, repeated string building) with the lean path (restricted
+response, SearchResult records, text built once) while many requests are in
+flight at the same time. No API keys or network access needed.
+
+Usage:
+    python benchmarks/bench_memory.py [concurrency]
+"""
+import sys
+import os
+import json
+import threading
+import time
+import tracemalloc
+
+# Add parent directory to path so we can import from tools
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.results import format_results, parse_organic_results
+
+PROMPT = "Extract and summarize the top 5 search results from the following content into JSON format:\n\n{text}"
+
+
+def make_full_response() -> bytes:
+    """A SerpAPI-like Google response with the sections we never use"""
+    organic = [
+        {
+            "position": i,
+            "title": f"Result {i}: a comprehensive guide to Python web frameworks in 2025",
+            "link": f"https://example.com/guides/{i}/python-web-frameworks",
+            "redirect_link": f"https://www.google.com/url?q=https://example.com/guides/{i}&sa=U" + "x" * 200,
+            "displayed_link": f"https://example.com › guides › {i}",
+            "favicon": "data:image/png;base64," + "A" * 1500,
+            "snippet": "Django, Flask and FastAPI compared on performance, ecosystem and learning curve. " * 3,
+            "snippet_highlighted_words": ["Django", "Flask", "FastAPI"] * 5,
+            "sitelinks": {"inline": [{"title": f"Section {j}", "link": f"https://example.com/{i}/{j}"} for j in range(6)]},
+            "rich_snippet": {"top": {"detected_extensions": {"rating": 4.5}, "extensions": ["Rating: 4.5", "Review"] * 3}},
+            "about_this_result": {"source": {"description": "Example is a site about programming. " * 10}},
+            "source": "Example",
+        }
+        for i in range(1, 11)
+    ]
+    response = {
+        "search_metadata": {"id": "x" * 24, "status": "Success", "json_endpoint": "https://serpapi.com/" + "y" * 80,
+                            "raw_html_file": "https://serpapi.com/" + "z" * 80, "total_time_taken": 1.2},
+        "search_parameters": {"engine": "google", "q": "python web frameworks", "google_domain": "google.com"},
+        "search_information": {"total_results": 123000000, "time_taken_displayed": 0.41},
+        "ads": [{"position": i, "title": f"Ad {i} " * 5, "description": "Buy now. " * 40,
+                 "link": f"https://ads.example.com/{i}", "sitelinks": [{"title": "Offer", "link": "https://ads.example.com"}] * 4}
+                for i in range(4)],
+        "knowledge_graph": {"title": "Python", "description": "Python is a programming language. " * 30,
+                            "header_images": [{"image": "data:image/jpeg;base64," + "B" * 4000}] * 4},
+        "inline_images": [{"link": f"https://images.example.com/{i}", "thumbnail": "data:image/jpeg;base64," + "C" * 3000}
+                          for i in range(30)],
+        "related_questions": [{"question": f"What is framework {i}?", "snippet": "An answer. " * 30,
+                               "link": f"https://example.com/q/{i}"} for i in range(8)],
+        "top_stories": [{"title": f"Story {i}", "link": f"https://news.example.com/{i}",
+                         "thumbnail": "data:image/jpeg;base64," + "D" * 2000} for i in range(6)],
+        "organic_results": organic,
+        "related_searches": [{"query": f"related search {i}", "link": "https://www.google.com/search?q=" + "r" * 100}
+                             for i in range(8)],
+        "pagination": {"current": 1, "other_pages": {str(i): "https://www.google.com/search?q=" + "p" * 150 for i in range(2, 11)}},
+    }
+    return json.dumps(response).encode("utf-8")
+
+
+def make_restricted_response(full: bytes) -> bytes:
+    """What SerpAPI returns with json_restrictor=organic_results[].{title,link,snippet}"""
+    organic = json.loads(full)["organic_results"]
+    return json.dumps({
+        "organic_results": [{k: r[k] for k in ("title", "link", "snippet")} for r in organic]
+    }).encode("utf-8")
+
+
+def original_path(payload: bytes, hold: threading.Barrier):
+    """The ingestion path before this change"""
+    # web_search: full response parsed, dict per result, f-string per result
+    results = json.loads(payload)
+    formatted_results = []
+    for i, result in enumerate(results.get("organic_results", [])[:10], 1):
+        title = result.get("title", "No title")
+        link = result.get("link", "No link")
+        snippet = result.get("snippet", "No snippet available")
+        formatted_results.append(f"{i}. {title}\n   URL: {link}\n   {snippet}\n")
+    result_text = "\n".join(formatted_results)
+    preview = f"Search results: {result_text[:200]}..."
+    # summarize_documents: list comprehension + join, then the prompt
+    del results, formatted_results  # released when web_search returned
+    combined_text = "\n\n".join([text for text in [result_text]])
+    prompt = PROMPT.format(text=combined_text)
+    # The text, its preview and the prompt are referenced while waiting on the LLM
+    hold.wait()
+    return result_text, preview, prompt
+
+
+def lean_path(payload: bytes, hold: threading.Barrier):
+    """The current ingestion path"""
+    # search_web: restricted response, parsed into records, response released
+    items = parse_organic_results(json.loads(payload))
+    result_text = format_results(items)
+    # summarize_documents: a single document is used as-is
+    prompt = PROMPT.format(text=result_text)
+    hold.wait()
+    return items, prompt
+
+
+def measure(path, payload: bytes, concurrency: int) -> tuple:
+    """Run `concurrency` requests at once; return (peak bytes, bytes held at the LLM call)"""
+    hold = threading.Barrier(concurrency + 1)
+    threads = [threading.Thread(target=path, args=(payload, hold)) for _ in range(concurrency)]
+
+    tracemalloc.start()
+    for thread in threads:
+        thread.start()
+    # Wait until every request is parked at the simulated LLM call
+    while hold.n_waiting < concurrency:
+        time.sleep(0.001)
+    held, _ = tracemalloc.get_traced_memory()
+    hold.wait()
+    for thread in threads:
+        thread.join()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, held
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    full = make_full_response()
+    restricted = make_restricted_response(full)
+
+    print("=" * 60)
+    print("Search Ingestion Memory Benchmark")
+    print("=" * 60)
+    print(f"Concurrent requests: {concurrency}")
+    print(f"SerpAPI response: {len(full) / 1024:.0f} KiB full, {len(restricted) / 1024:.1f} KiB restricted")
+    print("-" * 60)
+
+    # Payload bytes are shared by all threads, so they are created before tracing
+    before_single, _ = measure(original_path, full, 1)
+    after_single, _ = measure(lean_path, restricted, 1)
+    before_peak, before_held = measure(original_path, full, concurrency)
+    after_peak, after_held = measure(lean_path, restricted, concurrency)
+
+    print(f"{'':<12}{'single peak':>16}{'peak/request':>16}{'held/request':>16}")
+    for name, single, peak, held in (("Original", before_single, before_peak, before_held),
+                                     ("Lean", after_single, after_peak, after_held)):
+        print(f"{name:<12}{single / 1024:>13.1f}KiB{peak / concurrency / 1024:>13.1f}KiB"
+              f"{held / concurrency / 1024:>13.1f}KiB")
+    print(f"Reduction: {before_single / after_single:.1f}x single peak, "
+          f"{before_peak / after_peak:.1f}x concurrent peak, {before_held / after_held:.1f}x held")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
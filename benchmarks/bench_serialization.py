@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request response serialization overhead
+Compares the original /research path (json.loads -> ResearchResponse -> FastAPI
+encoder -> json.dumps) with the fast path (loads -> dumps -> ETag) on large
+batch responses. No API keys or network access needed.
+
+Usage:
+    python benchmarks/bench_serialization.py [num_results] [iterations]
+"""
+import sys
+import os
+import json
+import timeit
+
+# Add parent directory to path so we can import from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.serialization import dumps, loads, make_etag, orjson
+
+try:
+    from pydantic import BaseModel
+    from fastapi.encoders import jsonable_encoder
+except ImportError:
+    BaseModel = None
+
+
+def make_payload(num_results: int) -> str:
+    """Build an LLM-style JSON string with `num_results` summarized results"""
+    results = [
+        {
+            "rank": i,
+            "title": f"Result title number {i} about machine learning frameworks",
+            "url": f"https://example.com/articles/{i}/machine-learning-frameworks",
+            "summary": ("This article compares popular frameworks, covering ease of use, "
+                        "performance, ecosystem and deployment options. ") * 4
+        }
+        for i in range(1, num_results + 1)
+    ]
+    return json.dumps({"results": results}, indent=2)
+
+
+def original_path(result_json_str: str, model_cls) -> bytes:
+    """What /research did before: validate with Pydantic, encode with json"""
+    result_data = json.loads(result_json_str)
+    response = model_cls(status="success", data=result_data)
+    # FastAPI validates the return value against response_model, then encodes it
+    response = model_cls.model_validate(jsonable_encoder(response))
+    return json.dumps(
+        jsonable_encoder(response),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_path(result_json_str: str) -> bytes:
+    """Current /research path: parse once, serialize once, compute the ETag"""
+    body = dumps({"status": "success", "data": loads(result_json_str)})
+    make_etag(body)
+    return body
+
+
+def main():
+    num_results = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    payload = make_payload(num_results)
+    print("=" * 60)
+    print("Response Serialization Benchmark")
+    print("=" * 60)
+    print(f"Results per response: {num_results} ({len(payload) / 1024:.0f} KiB of LLM output)")
+    print(f"Encoder: {'orjson' if orjson is not None else 'json (orjson not installed)'}")
+    print("-" * 60)
+
+    fast = timeit.timeit(lambda: fast_path(payload), number=iterations) / iterations
+    print(f"Fast path:     {fast * 1000:8.3f} ms/request  ({len(fast_path(payload)) / 1024:.0f} KiB body)")
+
+    if BaseModel is None:
+        print("Original path: skipped (pydantic/fastapi not installed)")
+        return
+
+    class ResearchResponse(BaseModel):
+        """Mirror of api.ResearchResponse (importing api requires API keys)"""
+        status: str
+        data: dict
+
+    original = timeit.timeit(lambda: original_path(payload, ResearchResponse), number=iterations) / iterations
+    print(f"Original path: {original * 1000:8.3f} ms/request")
+    print(f"Speedup:       {original / fast:8.1f}x")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,17 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
-from utils.config import (
-    HUGGINGFACE_API_KEY, 
-    HUGGINGFACE_API_BASE, 
-    LLAMA_MODEL_NAME, 
-    DEFAULT_TEMPERATURE, 
-    DEFAULT_MAX_TOKENS
-)
+from langchain_core.runnables import RunnableLambda
+from tools.results import format_results
+from utils.llm_pool import get_llm_pool
 from utils.logger import get_logger
+from utils.serialization import loads
+from utils.store import content_key
 
 # Get logger for this module
 logger = get_logger("chains.summary")
 
-# Instantiate LLM with Llama 3.3 70B via HuggingFace
-llm = ChatOpenAI(
-    model=LLAMA_MODEL_NAME,
-    temperature=DEFAULT_TEMPERATURE,
-    max_tokens=DEFAULT_MAX_TOKENS,
-    base_url=HUGGINGFACE_API_BASE,
-    api_key=HUGGINGFACE_API_KEY
-)
+# Llama 3.3 70B served by the configured pool of OpenAI-compatible backends
+# (failover, load balancing and hedged requests are handled by the pool)
+llm = get_llm_pool()
 
 # Create a modern chat prompt template for summarization in JSON format
 summary_prompt = ChatPromptTemplate.from_messages([
@@ -42,7 +34,7 @@ Return ONLY the JSON object, nothing else."""),
 ])
 
 # Create a chain using the modern LCEL (LangChain Expression Language) syntax
-summary_chain = summary_prompt | llm
+summary_chain = summary_prompt | RunnableLambda(llm.invoke)
 
 def summarize_documents(docs):
     """
@@ -57,9 +49,13 @@ def summarize_documents(docs):
     """
     logger.info(f"📝 Summarization initiated for {len(docs)} document(s)")
     
-    # Combine all document content into a single text
-    combined_text = "\n\n".join([doc.page_content for doc in docs])
-    logger.debug(f"Combined text length: {len(combined_text)} characters")
+    # Combine all document content into a single text (a single document is
+    # used as-is rather than copied)
+    if len(docs) == 1:
+        combined_text = docs[0].page_content
+    else:
+        combined_text = "\n\n".join(doc.page_content for doc in docs)
+    logger.debug("Combined text length: %d characters", len(combined_text))
     
     # Invoke the chain with the combined text
     logger.info("🤖 Calling Llama 3.3 70B for JSON summarization...")
@@ -68,10 +64,80 @@ def summarize_documents(docs):
     # Extract the content from the response
     summary = response.content
     logger.info(f"✅ JSON summarization completed: {len(summary)} characters")
-    logger.debug(f"Summary preview: {summary[:150]}...")
+    logger.debug("Summary preview: %.150s...", summary)
     
     return summary
 
+# Prompt for summarizing individual search results (used when only some
+# results of a query need a fresh summary)
+item_summary_prompt = ChatPromptTemplate.from_messages([
+    ("system", """You are a helpful assistant that summarizes individual search results into JSON format.
+You must return ONLY valid JSON (no markdown, no extra text) in the following structure:
+{{
+  "results": [
+    {{
+      "url": "...",
+      "summary": "..."
+    }}
+  ]
+}}
+
+Write one concise summary for EVERY search result provided, copying its URL exactly as given.
+Return ONLY the JSON object, nothing else."""),
+    ("user", "Summarize each of the following search results into JSON format:\n\n{text}")
+])
+
+item_summary_chain = item_summary_prompt | RunnableLambda(llm.invoke)
+
+def summarize_items(items):
+    """
+    Summarize individual search results, one summary per URL.
+    
+    The model's reply identifies results by URL, so a URL may appear only once
+    per call. Summaries are returned by content key (URL + snippet), so a
+    summary is never attributed to a different snippet of the same URL.
+    
+    Args:
+        items: List of SearchResult records with distinct URLs
+        
+    Returns:
+        dict: Mapping of content key to summary, only for results the model
+        actually summarized. A malformed reply or skipped result is left out,
+        so callers can tell a fallback from a real summary.
+        
+    Raises:
+        ValueError: If two items share a URL
+    """
+    if not items:
+        return {}
+    keys = {item.link: content_key(item.link, item.snippet) for item in items}
+    if len(keys) < len(items):
+        raise ValueError("summarize_items needs at most one result per URL")
+    logger.info(f"📝 Per-URL summarization initiated for {len(items)} result(s)")
+    
+    text = format_results(items)
+    
+    logger.info("🤖 Calling Llama 3.3 70B for per-URL summaries...")
+    response = item_summary_chain.invoke({"text": text})
+    content = response.content
+    
+    summaries = {}
+    try:
+        # Tolerate stray text around the JSON object
+        data = loads(content[content.index("{"):content.rindex("}") + 1])
+        for result in data.get("results", []):
+            if result.get("url") in keys and result.get("summary"):
+                summaries[keys[result["url"]]] = result["summary"]
+    except ValueError as e:
+        logger.error(f"Invalid JSON returned for per-URL summaries: {e}")
+    
+    missing = len(items) - len(summaries)
+    if missing:
+        logger.warning(f"⚠️ {missing} result(s) not summarized by the model")
+    
+    logger.info(f"✅ Per-URL summarization completed: {len(summaries)} summaries")
+    return summaries
+
 # Example usage: pass a list of search result docs to summarize_documents
 # docs = [Document(page_content=result_text) for result_text in web_search_results_texts]
 # json_summary = summarize_documents(docs)
@@ -4,97 +4,46 @@ Example client showing how other agents/services can call the Research Agent API
 This demonstrates the decoupled architecture where other services can use this agent
 """
 
-import requests
-from typing import Optional, List, Dict
+from typing import Dict, Optional
 
-class ResearchAgentClient:
-    """Client for interacting with the Research Agent API"""
-    
-    def __init__(self, base_url: str = "http://localhost:8000"):
-        """
-        Initialize the client
-        
-        Args:
-            base_url: Base URL of the Research Agent API
-        """
-        self.base_url = base_url.rstrip('/')
-    
-    def health_check(self) -> bool:
-        """
-        Check if the Research Agent API is healthy
-        
-        Returns:
-            bool: True if API is healthy, False otherwise
-        """
-        try:
-            response = requests.get(f"{self.base_url}/health", timeout=5)
-            return response.status_code == 200
-        except Exception:
-            return False
-    
-    def research(self, query: str, timeout: int = 60) -> Optional[Dict]:
+from research_client import ResearchClient, ResearchClientError
+
+
+class ResearchAgentClient(ResearchClient):
+    """
+    Client for interacting with the Research Agent API, with the original
+    error handling: failures are printed and research() returns None (so
+    get_top_result returns None and get_all_results returns []) instead of
+    raising ResearchClientError. In iter_research a failed query yields None.
+    
+    Pooling, caching and retries come from ResearchClient, which new code
+    should use directly.
+    """
+    
+    def research(self, query: str, timeout: Optional[float] = None, use_cache: bool = True) -> Optional[Dict]:
         """
         Perform research using the Research Agent
         
         Args:
             query: The search query
-            timeout: Request timeout in seconds
+            timeout: Request timeout in seconds (defaults to the client's)
+            use_cache: Whether to use the client-side cache
             
         Returns:
             Dict with research results or None if failed
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/research",
-                json={"query": query},
-                timeout=timeout
-            )
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
+            return super().research(query, timeout, use_cache)
+        except ResearchClientError as e:
             print(f"Error calling Research Agent: {e}")
             return None
-    
-    def get_top_result(self, query: str) -> Optional[Dict]:
-        """
-        Get just the top research result
-        
-        Args:
-            query: The search query
-            
-        Returns:
-            Dict with the top result or None
-        """
-        results = self.research(query)
-        if results and results.get("status") == "success":
-            data = results.get("data", {})
-            results_list = data.get("results", [])
-            if results_list:
-                return results_list[0]
-        return None
-    
-    def get_all_results(self, query: str) -> List[Dict]:
-        """
-        Get all research results
-        
-        Args:
-            query: The search query
-            
-        Returns:
-            List of result dictionaries
-        """
-        results = self.research(query)
-        if results and results.get("status") == "success":
-            data = results.get("data", {})
-            return data.get("results", [])
-        return []
 
 
 def main():
     """Example usage of the Research Agent Client"""
     
     # Initialize client
-    client = ResearchAgentClient()
+    client = ResearchClient()
     
     # Check health
     print("Checking API health...")
@@ -113,7 +62,11 @@ def main():
     query = "best Python data visualization libraries"
     print(f"Query: {query}\n")
     
-    results = client.get_all_results(query)
+    try:
+        results = client.get_all_results(query)
+    except ResearchClientError as e:
+        print(f"❌ Error calling Research Agent: {e}")
+        results = []
     
     if results:
         print(f"Found {len(results)} results:\n")
@@ -133,7 +86,11 @@ def main():
     query = "FastAPI vs Flask comparison"
     print(f"Query: {query}\n")
     
-    top_result = client.get_top_result(query)
+    try:
+        top_result = client.get_top_result(query)
+    except ResearchClientError as e:
+        print(f"❌ Error calling Research Agent: {e}")
+        top_result = None
     
     if top_result:
         print(f"Top Result: {top_result['title']}")
@@ -141,6 +98,27 @@ def main():
         print(f"Summary: {top_result['summary']}")
     else:
         print("No results found")
+    
+    # Example 3: Research several queries concurrently
+    print("\n" + "=" * 60)
+    print("Example 3: Research many queries concurrently")
+    print("=" * 60)
+    
+    queries = [
+        "best Python testing frameworks",
+        "Python async web frameworks",
+        "Python packaging tools 2025"
+    ]
+    
+    # Results arrive as each query finishes, not in submission order
+    for query, response in client.iter_research(queries, concurrency=3):
+        if isinstance(response, ResearchClientError):
+            print(f"❌ {query}: {response}")
+            continue
+        results = response.get("data", {}).get("results", [])
+        print(f"✅ {query}: {len(results)} results")
+    
+    client.close()
 
 
 if __name__ == "__main__":
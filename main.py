@@ -1,62 +1,261 @@
-from agents.research import research_with_summary
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from agents.research import research_with_summary, refresh_research
+from utils.config import CLI_CACHE_TTL, CLI_CONCURRENCY
 from utils.logger import get_logger
+from utils.serialization import dumps
+from utils.store import get_store
+from utils.timing import StageTimer
 
 # Get logger for main
 logger = get_logger("main")
 
-def main():
+# Results from worker threads are printed one at a time
+print_lock = threading.Lock()
+
+def run_query(query: str, use_cache: bool = True, cache_ttl: float = CLI_CACHE_TTL) -> tuple:
     """
-    Main entry point for the Research Assistant.
-    Takes user input and runs the research agent to provide JSON-formatted summarized results.
+    Research a query, reusing the on-disk research store where possible.
+
+    A query researched less than `cache_ttl` seconds ago is answered from the
+    store. An older stored query is refreshed incrementally, so only new or
+    changed results are summarized again. Anything else gets a full run.
+
+    Args:
+        query: The research query
+        use_cache: Whether to look in the research store first
+        cache_ttl: Maximum age in seconds of a stored result to reuse as-is
+
+    Returns:
+        tuple: (JSON result string, StageTimer, source) where source is
+        'cache', 'refresh' or 'research'
+    """
+    timer = StageTimer()
+    store = get_store() if use_cache else None
+
+    if store is not None:
+        with timer.stage("cache"):
+            latest = store.latest_run(query)
+        if latest and time.time() - latest["created_at"] < cache_ttl:
+            logger.info(f"Cache hit for query: '{query}'")
+            return dumps(latest["data"]).decode("utf-8"), timer, "cache"
+        if latest:
+            return refresh_research(query, timer=timer), timer, "refresh"
+
+    return research_with_summary(query, timer=timer), timer, "research"
+
+def print_result(query: str, result: str, source: str, elapsed: float):
+    """Print one finished query's results"""
+    with print_lock:
+        print("-" * 50)
+        print(f"📝 Research Summary (JSON) for: {query}  [{source}, {elapsed:.1f}s]")
+        print(result)
+        print("-" * 50)
+        print()
+
+def print_progress(done: int, total: int, query: str, status: str):
+    """Show batch progress on stderr so stdout stays clean for results"""
+    with print_lock:
+        print(f"[{done}/{total}] {status} {query}", file=sys.stderr, flush=True)
+
+def print_bench(timings: list, wall_time: float):
+    """
+    Print per-stage timing statistics.
+
+    Args:
+        timings: List of (query, StageTimer, source) for every finished query
+        wall_time: Total elapsed time for the whole batch
+    """
+    stages = sorted({name for _, timer, _ in timings for name in timer.stages})
+    print("=" * 50, file=sys.stderr)
+    print(f"⏱️ Benchmark: {len(timings)} queries in {wall_time:.2f}s "
+          f"({len(timings) / wall_time:.2f} queries/s)", file=sys.stderr)
+    sources = {}
+    for _, _, source in timings:
+        sources[source] = sources.get(source, 0) + 1
+    print("   Sources: " + ", ".join(f"{name}={count}" for name, count in sorted(sources.items())),
+          file=sys.stderr)
+    print(f"   {'stage':<12}{'count':>7}{'total':>10}{'mean':>10}{'p50':>10}{'max':>10}", file=sys.stderr)
+    for name in stages + ["total"]:
+        if name == "total":
+            values = [timer.total for _, timer, _ in timings]
+        else:
+            values = [timer.stages[name] for _, timer, _ in timings if name in timer.stages]
+        print(f"   {name:<12}{len(values):>7}{sum(values):>9.2f}s{statistics.mean(values):>9.2f}s"
+              f"{statistics.median(values):>9.2f}s{max(values):>9.2f}s", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+
+def run_batch(queries: list, concurrency: int, use_cache: bool, cache_ttl: float, bench: bool):
+    """Research several queries concurrently, printing each result as it finishes"""
+    total = len(queries)
+    logger.info(f"Batch of {total} queries started (concurrency {concurrency})")
+    print(f"🔍 Researching {total} queries ({concurrency} at a time)...", file=sys.stderr)
+
+    timings = []
+    failed = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(run_query, query, use_cache, cache_ttl): (query, time.perf_counter())
+            for query in queries
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            query, submitted = futures[future]
+            try:
+                result, timer, source = future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(f"Error for query '{query}': {str(e)}", exc_info=True)
+                print_progress(done, total, query, "❌")
+                with print_lock:
+                    print(f"❌ Error for '{query}': {str(e)}", file=sys.stderr)
+                continue
+            timings.append((query, timer, source))
+            print_progress(done, total, query, "✅")
+            print_result(query, result, source, time.perf_counter() - submitted)
+    wall_time = time.perf_counter() - started
+
+    logger.info(f"Batch completed: {total - failed} succeeded, {failed} failed in {wall_time:.2f}s")
+    if bench and timings:
+        print_bench(timings, wall_time)
+    return failed
+
+def interactive(concurrency: int, use_cache: bool, cache_ttl: float, bench: bool) -> int:
+    """
+    Interactive mode: queries run in the background so the next one can be
+    typed right away, and results are printed as each finishes.
+
+    Returns:
+        int: 0 after 'quit' or end of input (once running queries finish),
+        130 after Ctrl+C
     """
     logger.info("Research Assistant started")
     print("🔍 Research Assistant")
     print("=" * 50)
-    print("Enter your research query (or 'quit' to exit)")
+    print("Enter your research queries (or 'quit' to exit)")
+    print("Queries run in the background - keep typing while they finish.")
     print()
-    
+
+    timings = []
+    pending = set()
+    started = time.perf_counter()
+
+    def on_done(future, query, submitted):
+        pending.discard(future)
+        if future.cancelled():
+            return
+        try:
+            result, timer, source = future.result()
+        except Exception as e:
+            logger.error(f"Error occurred: {str(e)}", exc_info=True)
+            with print_lock:
+                print(f"\n❌ Error for '{query}': {str(e)}")
+                print("Please try again with a different query.\n")
+            return
+        timings.append((query, timer, source))
+        print()
+        print_result(query, result, source, time.perf_counter() - submitted)
+        logger.info("Results displayed to user")
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    interrupted = False
     while True:
         try:
-            # Get user input
-            query = input("Query: ").strip()
-            
+            # Get user input; end of input (Ctrl+D, or a piped file) means 'quit'
+            try:
+                query = input("Query: ").strip()
+            except EOFError:
+                print()
+                query = "quit"
+
             # Check for exit condition
             if query.lower() in ['quit', 'exit', 'q']:
                 logger.info("User exited the application")
-                print("👋 Goodbye!")
+                if pending:
+                    print(f"⏳ Waiting for {len(pending)} running quer{'y' if len(pending) == 1 else 'ies'}...")
                 break
-            
+
             # Skip empty queries
             if not query:
                 logger.warning("Empty query received")
                 print("Please enter a valid query.")
                 continue
-            
-            print(f"\n🔎 Researching: {query}")
-            print("⏳ Searching and summarizing to JSON format...")
-            print("-" * 50)
-            
+
             logger.info(f"User query received: '{query}'")
-            
-            # Run the research agent
-            result = research_with_summary(query)
-            
-            # Print the results
-            print("📝 Research Summary (JSON):")
-            print(result)
-            print("-" * 50)
-            print()
-            
-            logger.info("Results displayed to user")
-            
+            print(f"🔎 Researching in background: {query}")
+
+            submitted = time.perf_counter()
+            future = executor.submit(run_query, query, use_cache, cache_ttl)
+            pending.add(future)
+            future.add_done_callback(lambda f, q=query, s=submitted: on_done(f, q, s))
+
         except KeyboardInterrupt:
             logger.info("Application interrupted by user (Ctrl+C)")
-            print("\n\n👋 Goodbye!")
+            interrupted = True
             break
-        except Exception as e:
-            logger.error(f"Error occurred: {str(e)}", exc_info=True)
-            print(f"\n❌ Error: {str(e)}")
-            print("Please try again with a different query.\n")
+
+    # On Ctrl+C, queued queries are dropped and running ones are not waited for
+    executor.shutdown(wait=not interrupted, cancel_futures=interrupted)
+
+    if bench and timings:
+        print_bench(timings, time.perf_counter() - started)
+    print("\n👋 Goodbye!")
+    return 130 if interrupted else 0
+
+def read_queries(path: str) -> list:
+    """Read one query per line from a file ('-' for stdin), skipping blanks and # comments"""
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        lines = [line.strip() for line in handle]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+def main(argv=None):
+    """
+    Main entry point for the Research Assistant.
+
+    With no arguments, runs interactively. Queries given as arguments, in a
+    file (--file) or piped on stdin are researched concurrently instead.
+    """
+    parser = argparse.ArgumentParser(description="Research Assistant - web search with AI-summarized JSON results")
+    parser.add_argument("queries", nargs="*", help="Queries to research (omit for interactive mode)")
+    parser.add_argument("-f", "--file", help="Read queries from a file, one per line ('-' for stdin)")
+    parser.add_argument("-j", "--concurrency", type=int, default=CLI_CONCURRENCY,
+                        help=f"Queries to run at once (default {CLI_CONCURRENCY})")
+    parser.add_argument("--cache-ttl", type=float, default=CLI_CACHE_TTL,
+                        help=f"Reuse stored results younger than this many seconds (default {CLI_CACHE_TTL:.0f})")
+    parser.add_argument("--no-cache", action="store_true", help="Always run a full research, ignoring stored results")
+    parser.add_argument("--bench", action="store_true", help="Report per-stage timings")
+    args = parser.parse_args(argv)
+
+    concurrency = max(1, args.concurrency)
+    use_cache = not args.no_cache
+
+    queries = list(args.queries)
+    if args.file:
+        queries.extend(read_queries(args.file))
+    elif not queries and not sys.stdin.isatty():
+        queries = read_queries("-")
+
+    if not queries:
+        return interactive(concurrency, use_cache, args.cache_ttl, args.bench)
+
+    return 1 if run_batch(queries, concurrency, use_cache, args.cache_ttl, args.bench) else 0
 
 if __name__ == "__main__":
-    main()
+    exit_code = main()
+    if exit_code == 130:
+        # Interrupted: exit without joining worker threads still running abandoned queries
+        sys.stdout.flush()
+        sys.stderr.flush()
+        logging.shutdown()
+        os._exit(exit_code)
+    sys.exit(exit_code)
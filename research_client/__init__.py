@@ -0,0 +1,17 @@
+"""
+Python SDK for the Research Agent API
+Pooled sync client (requests) and async client (httpx) with result caching,
+concurrency-limited batch research and retries honoring Retry-After
+"""
+from research_client.errors import ResearchClientError
+from research_client.sync_client import ResearchClient
+
+__all__ = ["ResearchClient", "AsyncResearchClient", "ResearchClientError"]
+
+
+def __getattr__(name):
+    # httpx is only needed for the async client, so import it lazily
+    if name == "AsyncResearchClient":
+        from research_client.async_client import AsyncResearchClient
+        return AsyncResearchClient
+    raise AttributeError(f"module 'research_client' has no attribute '{name}'")
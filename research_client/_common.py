@@ -0,0 +1,123 @@
+"""
+Helpers shared by the sync and async clients
+Retry timing, Retry-After parsing and the client-side result cache
+"""
+import random
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Statuses worth retrying: the request was shed before any research started.
+# Only retried when the server says when to come back (Retry-After), since a
+# 503 from elsewhere (e.g. a proxy timeout) may mean the research is running
+RETRY_STATUSES = {429, 503}
+
+
+def normalize_query(query: str) -> str:
+    """Queries that differ only in case or whitespace share a cache entry"""
+    return " ".join(query.lower().split())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header into seconds
+    
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def should_retry_status(status_code: int, retry_after: Optional[str]) -> bool:
+    """Whether a response is a load-shedding rejection that is safe to send again"""
+    return status_code in RETRY_STATUSES and parse_retry_after(retry_after) is not None
+
+
+def retry_delay(attempt: int, retry_after: Optional[str], backoff_base: float, backoff_max: float) -> float:
+    """
+    How long to wait before retry number `attempt` (starting at 0)
+    
+    The server's Retry-After wins when present; otherwise exponential backoff
+    with full jitter so many clients don't retry in lockstep.
+    """
+    server_delay = parse_retry_after(retry_after)
+    if server_delay is not None:
+        return min(server_delay, backoff_max)
+    return random.uniform(0, min(backoff_max, backoff_base * (2 ** attempt)))
+
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "expires_at")
+    
+    def __init__(self, data: dict, etag: Optional[str], expires_at: float):
+        self.data = data
+        self.etag = etag
+        self.expires_at = expires_at
+    
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResultCache:
+    """
+    LRU cache of research responses
+    
+    Expired entries are kept (until evicted) so their ETag can be used to
+    revalidate with the server instead of running the research again.
+    """
+    
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, query: str) -> Optional[CacheEntry]:
+        key = normalize_query(query)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+            return entry
+    
+    def set(self, query: str, data: dict, etag: Optional[str] = None):
+        key = normalize_query(query)
+        with self._lock:
+            self._data[key] = CacheEntry(data, etag, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def top_result(response: Optional[dict]) -> Optional[dict]:
+    """First result of a research response, or None"""
+    results = all_results(response)
+    return results[0] if results else None
+
+
+def all_results(response: Optional[dict]) -> list:
+    """All results of a research response, or an empty list"""
+    # "degraded" responses are stored results served while the API is overloaded
+    if response and response.get("status") in ("success", "degraded"):
+        return response.get("data", {}).get("results", [])
+    return []
@@ -0,0 +1,200 @@
+import asyncio
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import httpx
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError("AsyncResearchClient requires httpx: pip install httpx") from e
+
+from research_client._common import (
+    ResultCache,
+    all_results,
+    retry_delay,
+    should_retry_status,
+    top_result
+)
+from research_client.errors import ResearchClientError
+
+
+class AsyncResearchClient:
+    """
+    Asynchronous client for the Research Agent API
+    
+    Same behaviour as ResearchClient (pooling, caching, retrying failed
+    connects and 429/503 with Retry-After) on top of httpx.AsyncClient. Concurrent calls share one
+    connection pool and at most `max_connections` requests are in flight.
+    
+    Example:
+        async with AsyncResearchClient("http://localhost:8000") as client:
+            async for query, response in client.iter_research(queries):
+                print(query, response)
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache_ttl: float = 300.0,
+        max_connections: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize the client
+        
+        Args:
+            base_url: Base URL of the Research Agent API
+            timeout: Default request timeout in seconds
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: First backoff delay in seconds (doubles every retry)
+            backoff_max: Upper bound for any single wait, including Retry-After
+            cache_ttl: Seconds a research response is reused without asking the server (0 disables)
+            max_connections: Size of the connection pool and default concurrency limit
+            transport: Custom httpx transport (e.g. httpx.MockTransport in tests)
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.cache = ResultCache(ttl=cache_ttl) if cache_ttl > 0 else None
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport
+        )
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        await self.aclose()
+    
+    async def _request(self, method: str, path: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """Send a request, retrying failed connects and load-shedding rejections"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.request(method, path, timeout=timeout or self.timeout, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                # The request was never sent, so sending it again can't start a second research run
+                if attempt == self.max_retries:
+                    raise ResearchClientError(f"Research Agent unreachable: {e}") from e
+                await asyncio.sleep(retry_delay(attempt, None, self.backoff_base, self.backoff_max))
+                continue
+            except httpx.TransportError as e:
+                raise ResearchClientError(f"Research Agent request failed: {e}") from e
+            
+            retry_after = response.headers.get("Retry-After")
+            if should_retry_status(response.status_code, retry_after) and attempt < self.max_retries:
+                await asyncio.sleep(retry_delay(attempt, retry_after, self.backoff_base, self.backoff_max))
+                continue
+            if response.status_code >= 400:
+                raise ResearchClientError(
+                    f"Research Agent returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code
+                )
+            return response
+    
+    async def health_check(self) -> bool:
+        """
+        Check if the Research Agent API is healthy
+        
+        Returns:
+            bool: True if API is healthy, False otherwise
+        """
+        try:
+            response = await self.client.get("/health", timeout=5)
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+    
+    async def research(self, query: str, timeout: Optional[float] = None, use_cache: bool = True) -> Dict:
+        """
+        Perform research using the Research Agent
+        
+        Args:
+            query: The search query
+            timeout: Request timeout in seconds (defaults to the client's)
+            use_cache: Whether to use the client-side cache
+            
+        Returns:
+            Dict with status and research data
+            
+        Raises:
+            ResearchClientError: If the request fails after retries
+        """
+        entry = self.cache.get(query) if self.cache is not None and use_cache else None
+        if entry is not None and entry.fresh:
+            return entry.data
+        
+        if entry is not None and entry.etag:
+            response = await self._request(
+                "GET", "/research", timeout=timeout,
+                params={"query": query}, headers={"If-None-Match": entry.etag}
+            )
+            data = entry.data if response.status_code == 304 else response.json()
+        else:
+            response = await self._request("POST", "/research", timeout=timeout, json={"query": query})
+            data = response.json()
+        
+        if self.cache is not None:
+            self.cache.set(query, data, response.headers.get("ETag") or (entry.etag if entry else None))
+        return data
+    
+    async def iter_research(self, queries: Iterable[str], concurrency: Optional[int] = None,
+                            timeout: Optional[float] = None) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Research many queries concurrently, yielding each as soon as it finishes
+        
+        Args:
+            queries: Queries to research
+            concurrency: Maximum requests in flight (defaults to the pool size)
+            timeout: Per-request timeout in seconds
+            
+        Yields:
+            (query, response) pairs in completion order. A failed query yields
+            its ResearchClientError instead of a response.
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.max_connections)
+        
+        async def run(query: str) -> Tuple[str, object]:
+            async with semaphore:
+                try:
+                    return query, await self.research(query, timeout)
+                except ResearchClientError as e:
+                    return query, e
+        
+        tasks = [asyncio.ensure_future(run(query)) for query in dict.fromkeys(queries)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early - don't leave requests running
+            for task in tasks:
+                task.cancel()
+    
+    async def research_many(self, queries: Iterable[str], concurrency: Optional[int] = None,
+                            timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Research many queries concurrently and return all responses
+        
+        Returns:
+            Dict mapping each query to its response (or ResearchClientError)
+        """
+        return {query: response async for query, response in self.iter_research(queries, concurrency, timeout)}
+    
+    async def get_top_result(self, query: str) -> Optional[Dict]:
+        """Get just the top research result (served from cache if already researched)"""
+        return top_result(await self.research(query))
+    
+    async def get_all_results(self, query: str) -> List[Dict]:
+        """Get all research results (served from cache if already researched)"""
+        return all_results(await self.research(query))
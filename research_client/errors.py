@@ -0,0 +1,9 @@
+from typing import Optional
+
+
+class ResearchClientError(Exception):
+    """Raised when the Research Agent API cannot be reached or returns an error"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
@@ -0,0 +1,222 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ProtocolError
+
+from research_client._common import (
+    ResultCache,
+    all_results,
+    retry_delay,
+    should_retry_status,
+    top_result
+)
+from research_client.errors import ResearchClientError
+
+
+def _connect_failed(error: requests.ConnectionError) -> bool:
+    """True if the request never reached the server (refused, DNS failure, connect timeout)"""
+    # A connection dropped after the request was sent surfaces as a ProtocolError
+    return not (error.args and isinstance(error.args[0], ProtocolError))
+
+
+class ResearchClient:
+    """
+    Synchronous client for the Research Agent API
+    
+    Connections are pooled in a requests.Session and research responses are
+    cached client-side. Requests that could not connect, or were shed by the
+    server with 429/503 and Retry-After, are retried with backoff. Read
+    timeouts are not retried, since the server may still be running the
+    research.
+    
+    Example:
+        with ResearchClient("http://localhost:8000") as client:
+            for query, response in client.iter_research(["FastAPI", "Flask"]):
+                print(query, response)
+    """
+    
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        timeout: float = 60.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        cache_ttl: float = 300.0,
+        max_connections: int = 10
+    ):
+        """
+        Initialize the client
+        
+        Args:
+            base_url: Base URL of the Research Agent API
+            timeout: Default request timeout in seconds
+            max_retries: Retries after the first attempt for retryable failures
+            backoff_base: First backoff delay in seconds (doubles every retry)
+            backoff_max: Upper bound for any single wait, including Retry-After
+            cache_ttl: Seconds a research response is reused without asking the server (0 disables)
+            max_connections: Size of the connection pool
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections = max_connections
+        self.cache = ResultCache(ttl=cache_ttl) if cache_ttl > 0 else None
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _request(self, method: str, path: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Send a request, retrying failed connects and load-shedding rejections"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(
+                    method, f"{self.base_url}{path}", timeout=timeout or self.timeout, **kwargs
+                )
+            except requests.ConnectionError as e:
+                # Sending again after the request reached the server would
+                # start a second research run while the first is still going
+                if attempt == self.max_retries or not _connect_failed(e):
+                    raise ResearchClientError(f"Research Agent unreachable: {e}") from e
+                time.sleep(retry_delay(attempt, None, self.backoff_base, self.backoff_max))
+                continue
+            except requests.RequestException as e:
+                raise ResearchClientError(f"Research Agent request failed: {e}") from e
+            
+            retry_after = response.headers.get("Retry-After")
+            if should_retry_status(response.status_code, retry_after) and attempt < self.max_retries:
+                time.sleep(retry_delay(attempt, retry_after, self.backoff_base, self.backoff_max))
+                continue
+            if response.status_code >= 400:
+                raise ResearchClientError(
+                    f"Research Agent returned {response.status_code}: {response.text[:200]}",
+                    status_code=response.status_code
+                )
+            return response
+    
+    def health_check(self) -> bool:
+        """
+        Check if the Research Agent API is healthy
+        
+        Returns:
+            bool: True if API is healthy, False otherwise
+        """
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=5)
+            return response.status_code == 200
+        except requests.RequestException:
+            return False
+    
+    def research(self, query: str, timeout: Optional[float] = None, use_cache: bool = True) -> Dict:
+        """
+        Perform research using the Research Agent
+        
+        A cached response is returned without contacting the server while it
+        is fresh. Once stale, it is revalidated with its ETag so an unchanged
+        result is not sent (or researched) again.
+        
+        Args:
+            query: The search query
+            timeout: Request timeout in seconds (defaults to the client's)
+            use_cache: Whether to use the client-side cache
+            
+        Returns:
+            Dict with status and research data
+            
+        Raises:
+            ResearchClientError: If the request fails after retries
+        """
+        entry = self.cache.get(query) if self.cache is not None and use_cache else None
+        if entry is not None and entry.fresh:
+            return entry.data
+        
+        if entry is not None and entry.etag:
+            response = self._request(
+                "GET", "/research", timeout=timeout,
+                params={"query": query}, headers={"If-None-Match": entry.etag}
+            )
+            data = entry.data if response.status_code == 304 else response.json()
+        else:
+            response = self._request("POST", "/research", timeout=timeout, json={"query": query})
+            data = response.json()
+        
+        if self.cache is not None:
+            self.cache.set(query, data, response.headers.get("ETag") or (entry.etag if entry else None))
+        return data
+    
+    def iter_research(self, queries: Iterable[str], concurrency: Optional[int] = None,
+                      timeout: Optional[float] = None) -> Iterator[Tuple[str, object]]:
+        """
+        Research many queries concurrently, yielding each as soon as it finishes
+        
+        Args:
+            queries: Queries to research
+            concurrency: Maximum requests in flight (defaults to the pool size)
+            timeout: Per-request timeout in seconds
+            
+        Yields:
+            (query, response) pairs in completion order. A failed query yields
+            its ResearchClientError instead of a response.
+        """
+        executor = ThreadPoolExecutor(max_workers=concurrency or self.max_connections)
+        try:
+            futures = {executor.submit(self.research, query, timeout): query for query in dict.fromkeys(queries)}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except ResearchClientError as e:
+                    yield futures[future], e
+        finally:
+            # Consumer stopped early - don't send the queries still queued
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def research_many(self, queries: Iterable[str], concurrency: Optional[int] = None,
+                      timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Research many queries concurrently and return all responses
+        
+        Returns:
+            Dict mapping each query to its response (or ResearchClientError)
+        """
+        return dict(self.iter_research(queries, concurrency, timeout))
+    
+    def get_top_result(self, query: str) -> Optional[Dict]:
+        """
+        Get just the top research result (served from cache if already researched)
+        
+        Args:
+            query: The search query
+            
+        Returns:
+            Dict with the top result or None
+        """
+        return top_result(self.research(query))
+    
+    def get_all_results(self, query: str) -> List[Dict]:
+        """
+        Get all research results (served from cache if already researched)
+        
+        Args:
+            query: The search query
+            
+        Returns:
+            List of result dictionaries
+        """
+        return all_results(self.research(query))
@@ -0,0 +1,108 @@
+"""
+Test script for API admission control
+Simulates concurrent requests against the AdmissionController, no server needed
+"""
+import sys
+import os
+import asyncio
+
+# Add parent directory to path so we can import from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.admission import AdmissionController, Rejected, parse_api_key_priorities
+
+
+async def _admission_scenario():
+    admission = AdmissionController(
+        max_in_flight=1,
+        max_queue=2,
+        max_queue_time={"interactive": 1.0, "batch": 1.0},
+        initial_service_time=0.1
+    )
+    order = []
+
+    async def request(name, priority, hold=0.1):
+        async with admission.slot(priority):
+            order.append(name)
+            await asyncio.sleep(hold)
+
+    # One running, then a batch and an interactive request queue up:
+    # the interactive one is served first even though it arrived later
+    running = asyncio.ensure_future(request("first", "batch"))
+    await asyncio.sleep(0.01)
+    batch = asyncio.ensure_future(request("batch", "batch"))
+    await asyncio.sleep(0.01)
+    interactive = asyncio.ensure_future(request("interactive", "interactive"))
+    await asyncio.sleep(0.01)
+
+    # The queue is full, so the next request is shed with 429 right away
+    try:
+        await request("overflow", "batch")
+        raise AssertionError("expected the request to be shed")
+    except Rejected as e:
+        assert e.status_code == 429 and e.retry_after >= 1
+
+    await asyncio.gather(running, batch, interactive)
+    assert order == ["first", "interactive", "batch"], order
+
+    metrics = admission.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["admitted"] == {"interactive": 1, "batch": 2}
+    assert metrics["shed"]["batch"] == {"queue_full": 1}
+
+
+def test_admission():
+    """Requests are prioritized, shed when the queue is full, and counted"""
+    asyncio.run(_admission_scenario())
+    print("✅ Admission control test passed")
+
+
+def test_api_key_priorities():
+    assert parse_api_key_priorities("abc:batch, def:interactive") == {"abc": "batch", "def": "interactive"}
+    assert parse_api_key_priorities("") == {}
+    try:
+        parse_api_key_priorities("abc:urgent")
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    print("✅ API key priority parsing test passed")
+
+
+def test_degraded_response():
+    """A shed request answered from the result cache is marked degraded, like a store fallback"""
+    # The agent validates its configuration on import
+    os.environ.setdefault("SERPAPI_API_KEY", "test")
+    os.environ.setdefault("HUGGINGFACE_API_KEY", "test")
+    import utils.store
+    from utils.serialization import dumps, loads, make_etag
+
+    # No store needed: utils.config may already be imported, so setting
+    # RESEARCH_STORE_PATH alone wouldn't keep api from opening data/research.db
+    original_env = os.environ.get("RESEARCH_STORE_PATH")
+    original_path = utils.store.RESEARCH_STORE_PATH
+    os.environ["RESEARCH_STORE_PATH"] = ""
+    utils.store.RESEARCH_STORE_PATH = ""
+    try:
+        import api
+
+        data = {"results": [{"rank": 1, "title": "FastAPI", "url": "https://fastapi.tiangolo.com", "summary": "Fast."}]}
+        body = dumps({"status": "success", "data": data})
+        api.result_cache.set("python web frameworks", api.CachedResult(body, make_etag(body)))
+
+        degraded = asyncio.run(api._degraded_result("Python web frameworks"))
+        assert loads(degraded.body) == {"status": "degraded", "data": data}
+        assert degraded.etag != make_etag(body)
+        assert asyncio.run(api._degraded_result("unknown query")) is None
+    finally:
+        utils.store.RESEARCH_STORE_PATH = original_path
+        if original_env is None:
+            os.environ.pop("RESEARCH_STORE_PATH", None)
+        else:
+            os.environ["RESEARCH_STORE_PATH"] = original_env
+    print("✅ Degraded response test passed")
+
+
+if __name__ == "__main__":
+    test_admission()
+    test_api_key_priorities()
+    test_degraded_response()
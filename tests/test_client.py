@@ -0,0 +1,237 @@
+"""
+Test script for the research_client SDK
+Checks retries, ETag revalidation and early exit from iter_research against
+mocked transports, without a running server
+"""
+import sys
+import os
+import asyncio
+import json
+import threading
+import time
+from email.utils import formatdate
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Add parent directory to path so we can import research_client
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from research_client import AsyncResearchClient, ResearchClient, ResearchClientError
+from research_client._common import ResultCache, parse_retry_after, retry_delay
+
+BODY = {"status": "success", "data": {"results": [{"rank": 1, "title": "FastAPI", "url": "https://fastapi.tiangolo.com",
+                                                   "summary": "Modern async framework."}]}}
+ETAG = 'W/"abc"'
+
+
+class ScriptedAdapter(BaseAdapter):
+    """requests transport that answers each request with the next scripted step"""
+
+    def __init__(self, steps, delay: float = 0.0):
+        super().__init__()
+        self.steps = list(steps)
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests.append(request)
+            step = self.steps.pop(0) if len(self.steps) > 1 else self.steps[0]
+        time.sleep(self.delay)
+        if isinstance(step, Exception):
+            raise step
+        status, headers, body = step
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = json.dumps(body).encode("utf-8") if body is not None else b""
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+def sync_client(adapter, **kwargs) -> ResearchClient:
+    client = ResearchClient("http://agent", backoff_base=0.01, **kwargs)
+    client.session.mount("http://", adapter)
+    return client
+
+
+def test_retry_after():
+    """Retry-After is honored in both formats and capped by backoff_max"""
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    http_date = parse_retry_after(formatdate(time.time() + 20, usegmt=True))
+    assert 15 < http_date <= 20
+
+    assert retry_delay(0, "7", backoff_base=0.5, backoff_max=30) == 7.0
+    assert retry_delay(0, "120", backoff_base=0.5, backoff_max=30) == 30
+    assert 0 <= retry_delay(3, None, backoff_base=0.5, backoff_max=30) <= 4.0
+    print("✅ Retry-After test passed")
+
+
+def test_result_cache():
+    """Entries are shared by normalized query and kept after expiry for revalidation"""
+    cache = ResultCache(ttl=0.05)
+    cache.set("Best  Python IDE", {"status": "success"}, etag='"abc"')
+
+    entry = cache.get("best python ide")
+    assert entry.fresh and entry.etag == '"abc"'
+
+    time.sleep(0.1)
+    entry = cache.get("best python ide")
+    assert not entry.fresh and entry.data == {"status": "success"}
+    print("✅ Result cache test passed")
+
+
+def test_sync_retries():
+    """Failed connects and shed requests are retried; read timeouts and plain 503s are not"""
+    adapter = ScriptedAdapter([(503, {"Retry-After": "0"}, None), (200, {"ETag": ETAG}, BODY)])
+    assert sync_client(adapter).research("FastAPI") == BODY
+    assert len(adapter.requests) == 2
+
+    adapter = ScriptedAdapter([requests.ConnectTimeout("connect timed out"), (200, {}, BODY)])
+    assert sync_client(adapter).research("FastAPI") == BODY
+    assert len(adapter.requests) == 2
+
+    for step in (requests.ReadTimeout("read timed out"), (503, {}, {"detail": "upstream timeout"})):
+        adapter = ScriptedAdapter([step, (200, {}, BODY)])
+        try:
+            sync_client(adapter).research("FastAPI")
+            raise AssertionError("expected ResearchClientError")
+        except ResearchClientError:
+            pass
+        assert len(adapter.requests) == 1, "a request that may be running must not be re-sent"
+    print("✅ Sync retry test passed")
+
+
+def test_sync_revalidation():
+    """A stale cached response is revalidated with its ETag and reused on 304"""
+    adapter = ScriptedAdapter([(200, {"ETag": ETAG}, BODY), (304, {"ETag": ETAG}, None)])
+    client = sync_client(adapter, cache_ttl=0.05)
+
+    assert client.research("FastAPI") == BODY
+    assert client.research("fastapi") == BODY  # fresh: no request
+    assert len(adapter.requests) == 1
+
+    time.sleep(0.1)
+    assert client.research("FastAPI") == BODY
+    revalidation = adapter.requests[1]
+    assert revalidation.method == "GET"
+    assert revalidation.headers["If-None-Match"] == ETAG
+    print("✅ Sync revalidation test passed")
+
+
+def test_sync_iter_research_early_exit():
+    """Breaking out of iter_research doesn't send the queries still queued"""
+    adapter = ScriptedAdapter([(200, {}, BODY)], delay=0.2)
+    client = sync_client(adapter, cache_ttl=0)
+
+    started = time.monotonic()
+    for query, response in client.iter_research([f"query {i}" for i in range(10)], concurrency=1):
+        assert response == BODY
+        break
+    assert time.monotonic() - started < 1.0
+
+    time.sleep(0.5)
+    # The first query, and at most the one that started as it finished
+    assert len(adapter.requests) <= 2, f"{len(adapter.requests)} requests sent after early exit"
+    print("✅ Sync iter_research early exit test passed")
+
+
+def test_legacy_client():
+    """ResearchAgentClient keeps returning None/[] on failure instead of raising"""
+    from example_client import ResearchAgentClient
+
+    client = ResearchAgentClient("http://agent", max_retries=0)
+    client.session.mount("http://", ScriptedAdapter([(500, {}, {"detail": "boom"})]))
+    assert client.research("FastAPI") is None
+    assert client.get_top_result("FastAPI") is None
+    assert client.get_all_results("FastAPI") == []
+    print("✅ Legacy client test passed")
+
+
+async def _async_scenarios():
+    calls = []
+    steps = []
+
+    async def handler(request):
+        calls.append(request)
+        step = steps.pop(0) if len(steps) > 1 else steps[0]
+        if isinstance(step, Exception):
+            raise step
+        if callable(step):
+            return await step(request)
+        status, headers, body = step
+        return httpx.Response(status, headers=headers, json=body)
+
+    def client(**kwargs):
+        return AsyncResearchClient("http://agent", backoff_base=0.01, transport=httpx.MockTransport(handler), **kwargs)
+
+    # Connect errors and shed requests are retried
+    steps[:] = [httpx.ConnectError("refused"), (429, {"Retry-After": "0"}, None), (200, {"ETag": ETAG}, BODY)]
+    async with client() as research_client:
+        assert await research_client.research("FastAPI") == BODY
+    assert len(calls) == 3
+
+    # A read timeout may mean the research is running, so it is not retried
+    calls.clear()
+    steps[:] = [httpx.ReadTimeout("read timed out"), (200, {}, BODY)]
+    async with client() as research_client:
+        try:
+            await research_client.research("FastAPI")
+            raise AssertionError("expected ResearchClientError")
+        except ResearchClientError:
+            pass
+    assert len(calls) == 1
+
+    # Stale entries are revalidated with If-None-Match
+    calls.clear()
+    steps[:] = [(200, {"ETag": ETAG}, BODY), (304, {"ETag": ETAG}, None)]
+    async with client(cache_ttl=0.05) as research_client:
+        assert await research_client.research("FastAPI") == BODY
+        await asyncio.sleep(0.1)
+        assert await research_client.research("FastAPI") == BODY
+    assert calls[1].method == "GET" and calls[1].headers["If-None-Match"] == ETAG
+
+    # Breaking out of iter_research cancels the remaining requests
+    calls.clear()
+    finished = []
+
+    async def slow(request):
+        await asyncio.sleep(0.2)
+        finished.append(request)
+        return httpx.Response(200, json=BODY)
+
+    steps[:] = [slow]
+    async with client(cache_ttl=0) as research_client:
+        stream = research_client.iter_research([f"query {i}" for i in range(10)], concurrency=1)
+        async for query, response in stream:
+            assert response == BODY
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.5)
+    assert len(calls) <= 2 and len(finished) == 1, f"{len(calls)} sent, {len(finished)} finished"
+
+
+def test_async_client():
+    """The async client retries, revalidates and cancels like the sync one"""
+    asyncio.run(_async_scenarios())
+    print("✅ Async client test passed")
+
+
+if __name__ == "__main__":
+    test_retry_after()
+    test_result_cache()
+    test_sync_retries()
+    test_sync_revalidation()
+    test_sync_iter_research_early_exit()
+    test_legacy_client()
+    test_async_client()
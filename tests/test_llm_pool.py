@@ -0,0 +1,100 @@
+"""
+Test script for the LLM backend pool
+Uses fake backends so failover and hedging can be checked without network access
+"""
+import sys
+import os
+import asyncio
+import random
+import time
+
+# Add parent directory to path so we can import from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from langchain_core.messages import AIMessageChunk
+from utils.llm_pool import Backend, LLMPool
+
+
+class FakeLLM:
+    """Streams a fixed reply after an optional delay, or raises"""
+
+    def __init__(self, reply: str, delay: float = 0.0, error: Exception = None):
+        self.reply = reply
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def astream(self, messages):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        for word in self.reply.split(" "):
+            yield AIMessageChunk(content=word + " ")
+
+
+def test_failover():
+    """A failing backend is skipped and the next one answers"""
+    broken = Backend("broken", FakeLLM("", error=RuntimeError("boom")), weight=1000)
+    working = Backend("working", FakeLLM("hello world"), weight=1)
+    # Seeded so the weighted pick deterministically tries the broken backend first
+    pool = LLMPool([broken, working], failure_threshold=1, cooldown=60, rng=random.Random(0))
+
+    response = pool.invoke("hi")
+
+    assert response.content.strip() == "hello world"
+    assert broken.failures == 1
+    assert not broken.is_healthy()
+    print("✅ Failover test passed")
+
+
+def test_hedging():
+    """A slow primary is hedged, the faster backend wins and the loser is cancelled"""
+    slow_llm = FakeLLM("slow reply", delay=30.0)
+    slow = Backend("slow", slow_llm, weight=1000)
+    fast = Backend("fast", FakeLLM("fast reply"), weight=1)
+    pool = LLMPool([slow, fast], hedge_enabled=True, hedge_min_delay=0.1, hedge_default_delay=0.1,
+                   rng=random.Random(0))
+
+    started = time.monotonic()
+    response = pool.invoke("hi")
+    elapsed = time.monotonic() - started
+
+    assert response.content.strip() == "fast reply"
+    assert elapsed < 1.0, f"hedged request took {elapsed:.2f}s"
+
+    # The loser was still waiting for its first token and is cancelled, not left running
+    deadline = time.monotonic() + 1.0
+    while slow.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert slow_llm.cancelled == 1
+    assert slow.in_flight == 0
+    assert slow.failures == 0
+    # The loser's wait so far still counts towards its latency percentile
+    assert len(slow._ttft) == 1 and slow._ttft[0] >= 0.1
+    print(f"✅ Hedging test passed ({elapsed:.2f}s)")
+
+
+def test_hedge_budget():
+    """Once the hedge budget is used up, slow requests wait for their backend"""
+    slow = Backend("slow", FakeLLM("slow reply", delay=0.3), weight=1000)
+    fast = Backend("fast", FakeLLM("fast reply"), weight=1)
+    pool = LLMPool([slow, fast], hedge_enabled=True, hedge_min_delay=0.1, hedge_default_delay=0.1,
+                   hedge_max_ratio=0.05, rng=random.Random(0))
+
+    assert pool.invoke("hi").content.strip() == "fast reply"
+    # One hedge in one request is far over 5%
+    assert pool.invoke("hi").content.strip() == "slow reply"
+    assert fast.llm.calls == 1
+    print("✅ Hedge budget test passed")
+
+
+if __name__ == "__main__":
+    test_failover()
+    test_hedging()
+    test_hedge_budget()
@@ -0,0 +1,166 @@
+"""
+Test script for the command-line interface
+The research runners and the store are replaced with fakes, so no API calls are made
+"""
+import sys
+import os
+import builtins
+import json
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+# Add parent directory to path so we can import main
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The research agent validates its configuration on import
+os.environ.setdefault("SERPAPI_API_KEY", "test")
+os.environ.setdefault("HUGGINGFACE_API_KEY", "test")
+
+import main
+
+STORED = {"results": [{"rank": 1, "title": "FastAPI", "url": "https://fastapi.tiangolo.com", "summary": "Stored"}]}
+
+
+class FakeStore:
+    """Returns a run for known queries, created `age` seconds ago"""
+
+    def __init__(self, runs: dict):
+        self.runs = runs
+        self.lookups = []
+
+    def latest_run(self, query):
+        self.lookups.append(query)
+        age = self.runs.get(query)
+        if age is None:
+            return None
+        return {"created_at": time.time() - age, "data": STORED}
+
+
+def fake_runner(name):
+    def run(query, timer=None):
+        with timer.stage("summarize"):
+            if query == "bad":
+                raise RuntimeError("boom")
+        return json.dumps({"runner": name, "query": query})
+    return run
+
+
+@contextmanager
+def fakes(store):
+    """Replace the store and research runners, restoring the real ones afterwards"""
+    originals = (main.get_store, main.research_with_summary, main.refresh_research)
+    main.get_store = lambda: store
+    main.research_with_summary = fake_runner("research")
+    main.refresh_research = fake_runner("refresh")
+    try:
+        yield
+    finally:
+        main.get_store, main.research_with_summary, main.refresh_research = originals
+
+
+def test_run_query():
+    """Fresh stored results are reused, stale ones refreshed, unknown queries researched"""
+    store = FakeStore({"fresh": 10, "stale": 7200})
+    with fakes(store):
+        result, timer, source = main.run_query("fresh", cache_ttl=3600)
+        assert source == "cache"
+        assert json.loads(result) == STORED
+        assert "cache" in timer.stages
+
+        result, _, source = main.run_query("stale", cache_ttl=3600)
+        assert source == "refresh"
+        assert json.loads(result)["runner"] == "refresh"
+
+        result, _, source = main.run_query("unknown", cache_ttl=3600)
+        assert source == "research"
+        assert json.loads(result)["runner"] == "research"
+
+        # --no-cache skips the store entirely
+        store.lookups.clear()
+        _, _, source = main.run_query("fresh", use_cache=False)
+        assert source == "research"
+        assert store.lookups == []
+    print("✅ run_query test passed")
+
+
+def test_read_queries():
+    """Blank lines and # comments are skipped"""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as handle:
+        handle.write("# weekly queries\nfirst query\n\n  second query  \n# done\n")
+    try:
+        assert main.read_queries(handle.name) == ["first query", "second query"]
+    finally:
+        os.remove(handle.name)
+    print("✅ read_queries test passed")
+
+
+def test_run_batch():
+    """Every query runs, and the exit code reflects failures"""
+    with fakes(FakeStore({})):
+        assert main.run_batch(["a", "b", "bad"], concurrency=2, use_cache=True, cache_ttl=3600, bench=True) == 1
+        assert main.main(["a", "b", "-j", "2"]) == 0
+        assert main.main(["a", "bad", "--no-cache"]) == 1
+    print("✅ run_batch test passed")
+
+
+def run_interactive(*inputs):
+    """
+    Run interactive mode on a slow query followed by `inputs`, returning
+    (exit code, seconds taken, finished queries). The slow query finishes
+    half a second after the last input.
+    """
+    release = threading.Event()
+    finished = []
+
+    def slow_runner(query, timer=None):
+        release.wait(10)
+        finished.append(query)
+        return "{}"
+
+    values = iter(["slow query", *inputs])
+
+    def fake_input(prompt=""):
+        value = next(values)
+        if isinstance(value, BaseException):
+            time.sleep(0.1)  # let the query start
+            threading.Timer(0.5, release.set).start()
+            raise value
+        return value
+
+    original_input = builtins.input
+    builtins.input = fake_input
+    with fakes(FakeStore({})):
+        main.research_with_summary = slow_runner
+        try:
+            started = time.monotonic()
+            code = main.interactive(concurrency=1, use_cache=False, cache_ttl=0, bench=False)
+            return code, time.monotonic() - started, finished
+        finally:
+            builtins.input = original_input
+            release.set()
+
+
+def test_interactive_interrupt():
+    """Ctrl+C returns right away instead of waiting for running queries"""
+    code, elapsed, finished = run_interactive(KeyboardInterrupt())
+    assert code == 130
+    assert elapsed < 0.5 and finished == []
+    print("✅ Interactive interrupt test passed")
+
+
+def test_interactive_eof():
+    """End of input (Ctrl+D) exits like 'quit', once running queries finish"""
+    code, elapsed, finished = run_interactive(EOFError())
+    assert code == 0
+    assert finished == ["slow query"]
+    print("✅ Interactive end of input test passed")
+
+
+if __name__ == "__main__":
+    test_run_query()
+    test_read_queries()
+    test_run_batch()
+    test_interactive_interrupt()
+    test_interactive_eof()
@@ -0,0 +1,102 @@
+"""
+Test script for API response caching
+Checks ETag handling, the result cache and conditional GET /research
+without calling the search API or the LLM
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path so we can import from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.cache import TTLCache, normalize_query
+from utils.serialization import dumps, etag_matches, make_etag
+
+
+def test_etags():
+    """ETags are weak and match If-None-Match regardless of W/ prefixes"""
+    etag = make_etag(b'{"status":"success"}')
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert make_etag(b'{"status":"success"}') == etag
+    assert make_etag(b'{"status":"degraded"}') != etag
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+    print("✅ ETag test passed")
+
+
+def test_ttl_cache():
+    """Entries expire after the TTL and the least recently used entry is evicted"""
+    assert normalize_query("  Python   Web FRAMEWORKS ") == "python web frameworks"
+
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+    short = TTLCache(max_entries=2, ttl=0.05)
+    short.set("a", 1)
+    time.sleep(0.1)
+    assert short.get("a") is None
+    print("✅ TTL cache test passed")
+
+
+def test_conditional_get():
+    """GET /research serves cached results and answers a matching If-None-Match with 304"""
+    # The agent validates its configuration on import
+    os.environ.setdefault("SERPAPI_API_KEY", "test")
+    os.environ.setdefault("HUGGINGFACE_API_KEY", "test")
+    from fastapi.testclient import TestClient
+    import utils.store
+
+    # No store needed: utils.config may already be imported, so setting
+    # RESEARCH_STORE_PATH alone wouldn't keep api from opening data/research.db
+    original_env = os.environ.get("RESEARCH_STORE_PATH")
+    original_path = utils.store.RESEARCH_STORE_PATH
+    os.environ["RESEARCH_STORE_PATH"] = ""
+    utils.store.RESEARCH_STORE_PATH = ""
+    try:
+        import api
+
+        query = "Python web frameworks"
+        data = {"results": [{"rank": 1, "title": "FastAPI", "url": "https://fastapi.tiangolo.com",
+                             "summary": "Modern async framework. " * 100}]}
+        body = dumps({"status": "success", "data": data})
+        api.result_cache.set(normalize_query(query), api.CachedResult(body, make_etag(body)))
+        client = TestClient(api.app)
+
+        response = client.get("/research", params={"query": "python  web frameworks"},
+                              headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "HIT"
+        assert response.headers["Content-Encoding"] == "gzip"
+        # The body is compressed, so the validator must be weak
+        assert response.headers["ETag"] == make_etag(body)
+        assert response.json()["data"] == data
+
+        not_modified = client.get("/research", params={"query": query},
+                                  headers={"If-None-Match": response.headers["ETag"]})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+    finally:
+        utils.store.RESEARCH_STORE_PATH = original_path
+        if original_env is None:
+            os.environ.pop("RESEARCH_STORE_PATH", None)
+        else:
+            os.environ["RESEARCH_STORE_PATH"] = original_env
+    print("✅ Conditional GET test passed")
+
+
+if __name__ == "__main__":
+    test_etags()
+    test_ttl_cache()
+    test_conditional_get()
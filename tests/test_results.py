@@ -0,0 +1,40 @@
+"""
+Test script for search result parsing
+Uses a canned SerpAPI response, no API keys needed
+"""
+import sys
+import os
+
+# Add parent directory to path so we can import from tools
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.results import SearchResult, format_results, parse_organic_results
+from utils.config import SEARCH_MAX_LINK_CHARS, SEARCH_MAX_SNIPPET_CHARS, SEARCH_MAX_TITLE_CHARS
+
+
+def test_parse_organic_results():
+    """Only title, link and snippet are kept, every field is bounded, ranks stay contiguous"""
+    response = {
+        "search_metadata": {"status": "Success"},
+        "organic_results": [
+            {"title": "FastAPI", "link": "https://fastapi.tiangolo.com", "snippet": "Modern", "favicon": "A" * 5000},
+            {"title": "Huge URL", "link": "https://example.com/?q=" + "x" * SEARCH_MAX_LINK_CHARS, "snippet": "Skipped"},
+            {"title": "T" * 1000, "link": "https://flask.palletsprojects.com", "snippet": "S" * 5000},
+            {"link": "https://www.djangoproject.com"},
+        ],
+    }
+
+    results = parse_organic_results(response, limit=2)
+    assert [r.link for r in results] == ["https://fastapi.tiangolo.com", "https://flask.palletsprojects.com"]
+    assert [r.position for r in results] == [1, 2]
+    assert len(results[1].title) == SEARCH_MAX_TITLE_CHARS
+    assert len(results[1].snippet) == SEARCH_MAX_SNIPPET_CHARS
+
+    results = parse_organic_results(response)
+    assert results[-1] == SearchResult(3, "No title", "https://www.djangoproject.com", "No snippet available")
+    assert "1. FastAPI\n   URL: https://fastapi.tiangolo.com\n   Modern" in format_results(results)
+    print("✅ Search result parsing test passed")
+
+
+if __name__ == "__main__":
+    test_parse_organic_results()
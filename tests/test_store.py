@@ -0,0 +1,116 @@
+"""
+Test script for the research store
+Uses an in-memory SQLite database, no API keys needed
+"""
+import sys
+import os
+import time
+
+# Add parent directory to path so we can import from utils
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.results import SearchResult
+from utils.store import ResearchStore, content_key
+
+ITEMS = [
+    SearchResult(1, "FastAPI", "https://fastapi.tiangolo.com", "Modern web framework"),
+    SearchResult(2, "Flask", "https://flask.palletsprojects.com", "Micro web framework"),
+]
+
+RESULT = {
+    "results": [
+        {"rank": 1, "title": "FastAPI", "url": "https://fastapi.tiangolo.com", "summary": "Fast async framework."},
+        {"rank": 2, "title": "Flask", "url": "https://flask.palletsprojects.com", "summary": "Minimal framework."},
+    ]
+}
+
+
+def test_store():
+    """Runs are recorded and per-URL summaries are reusable by content key"""
+    store = ResearchStore(":memory:")
+
+    run_id = store.record_run("Python  Web Frameworks", ITEMS, RESULT)
+    assert run_id == 1
+
+    # Summaries are addressed by URL + snippet
+    keys = [content_key(item.link, item.snippet) for item in ITEMS]
+    summaries = store.get_summaries(keys)
+    assert summaries[keys[0]] == "Fast async framework."
+
+    # A changed snippet is a different content key, so nothing is reused
+    changed = content_key(ITEMS[0].link, "Modern web framework, now with more")
+    assert store.get_summaries([changed]) == {}
+
+    # History is looked up by normalized query
+    history = store.history(query="python web frameworks")
+    assert len(history) == 1
+    assert history[0]["data"] == RESULT
+    assert "search_results" not in history[0]
+
+    latest = store.latest_run("PYTHON WEB FRAMEWORKS")
+    assert latest["search_results"] == [item.to_dict() for item in ITEMS]
+    print("✅ Research store test passed")
+
+
+def test_refresh_does_not_store_fallbacks():
+    """A result the model skipped shows its snippet, but is summarized again on the next refresh"""
+    # The research agent validates its configuration on import
+    os.environ.setdefault("SERPAPI_API_KEY", "test")
+    os.environ.setdefault("HUGGINGFACE_API_KEY", "test")
+    import agents.research as research
+
+    store = ResearchStore(":memory:")
+    llm_calls = []
+    replies = [{}, {content_key(ITEMS[0].link, ITEMS[0].snippet): "Fast async framework."}]
+
+    def fake_summarize(items):
+        llm_calls.append([item.link for item in items])
+        reply = replies.pop(0)
+        return {key: summary for key, summary in reply.items()
+                if key in {content_key(item.link, item.snippet) for item in items}}
+
+    originals = (research.search_web, research.summarize_items, research.get_store)
+    research.search_web = lambda query: ITEMS[:1]
+    research.summarize_items = fake_summarize
+    research.get_store = lambda: store
+    try:
+        # Malformed reply: the snippet is shown, nothing is stored as a summary
+        first = research.loads(research.refresh_research("python web frameworks"))
+        assert first["results"][0]["summary"] == ITEMS[0].snippet
+        assert store.get_summaries([content_key(ITEMS[0].link, ITEMS[0].snippet)]) == {}
+        assert store.latest_run("python web frameworks")["summarized"] == 0
+
+        # So the next refresh asks the model again instead of reusing the snippet
+        second = research.loads(research.refresh_research("python web frameworks"))
+        assert len(llm_calls) == 2
+        assert second["results"][0]["summary"] == "Fast async framework."
+        latest = store.latest_run("python web frameworks")
+        assert (latest["summarized"], latest["reused"]) == (1, 0)
+    finally:
+        research.search_web, research.summarize_items, research.get_store = originals
+    print("✅ Refresh fallback test passed")
+
+
+def test_prune():
+    """Old runs and unused summaries are deleted, a watch's latest run is kept"""
+    store = ResearchStore(":memory:")
+    old_run = store.record_run("old query", ITEMS, RESULT)
+    watched_run = store.record_run("watched query", ITEMS[:1], {"results": RESULT["results"][:1]})
+    watch = store.add_watch("watched query", 3600, next_run_at=0)
+    store.mark_watch_run(watch["id"], 0, run_id=watched_run)
+
+    time.sleep(0.05)
+    fresh_run = store.record_run("new query", ITEMS[1:], {"results": RESULT["results"][1:]})
+
+    assert store.prune(max_age=0.02) == {"runs": 1, "changes": 0, "summaries": 1}
+    assert store.get_run(old_run) is None
+    assert store.get_run(watched_run) is not None and store.get_run(fresh_run) is not None
+    keys = [content_key(item.link, item.snippet) for item in ITEMS]
+    assert list(store.get_summaries(keys)) == [keys[1]]
+    print("✅ Research store retention test passed")
+
+
+if __name__ == "__main__":
+    test_store()
+    test_refresh_does_not_store_fallbacks()
+    test_prune()
@@ -0,0 +1,194 @@
+"""
+Test script for the watchlist scheduler
+Search and summarization are replaced with fakes, so no API calls are made
+"""
+import sys
+import os
+import time
+from contextlib import contextmanager
+
+# Add parent directory to path so we can import from agents
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# The research agent validates its configuration on import
+os.environ.setdefault("SERPAPI_API_KEY", "test")
+os.environ.setdefault("HUGGINGFACE_API_KEY", "test")
+
+import agents.watchlist as watchlist
+from tools.results import SearchResult
+from utils.rate_limit import RateLimiter
+from utils.store import ResearchStore, content_key
+
+SEARCH_RESULTS = {
+    "python web frameworks": [
+        SearchResult(1, "FastAPI", "https://fastapi.tiangolo.com", "Modern"),
+        SearchResult(2, "Flask", "https://flask.palletsprojects.com", "Micro"),
+    ],
+    "python orms": [
+        SearchResult(1, "SQLAlchemy", "https://sqlalchemy.org", "Toolkit"),
+        SearchResult(2, "FastAPI", "https://fastapi.tiangolo.com", "Modern"),
+    ],
+}
+
+llm_calls = []
+searches = []
+
+
+def fake_search(query):
+    searches.append(query)
+    return SEARCH_RESULTS[query]
+
+
+def fake_summarize(items):
+    llm_calls.append([item.link for item in items])
+    return {content_key(item.link, item.snippet): f"Summary of {item.title} ({item.snippet})" for item in items}
+
+
+def failing_summarize(items):
+    llm_calls.append([item.link for item in items])
+    raise RuntimeError("LLM unavailable")
+
+
+def skipping_summarize(items):
+    """Like fake_summarize, but the model leaves Flask out of its answer"""
+    summaries = fake_summarize(items)
+    return {key: summary for key, summary in summaries.items() if "Flask" not in summary}
+
+
+@contextmanager
+def fakes(search=fake_search, summarize=fake_summarize):
+    """Replace search and summarization, restoring the real ones afterwards"""
+    originals = (watchlist.search_web, watchlist.summarize_items)
+    watchlist.search_web = search
+    watchlist.summarize_items = summarize
+    llm_calls.clear()
+    searches.clear()
+    try:
+        yield
+    finally:
+        watchlist.search_web, watchlist.summarize_items = originals
+
+
+def make_scheduler(store, **kwargs):
+    fast = RateLimiter(per_minute=60000, burst=100)
+    kwargs.setdefault("search_reuse_seconds", 0)
+    return watchlist.WatchlistScheduler(
+        store, summary_batch_size=10, search_limiter=fast, llm_limiter=fast, **kwargs
+    )
+
+
+def test_watchlist():
+    """Due queries are batched, summaries are shared and reused, changes are recorded"""
+    with fakes():
+        store = ResearchStore(":memory:")
+        scheduler = make_scheduler(store)
+        first = store.add_watch("python web frameworks", 3600, next_run_at=0)
+        store.add_watch("python orms", 3600, next_run_at=0)
+
+        # Both queries run in one batch, and the shared FastAPI result is summarized once
+        assert scheduler.run_due_batch() == 2
+        assert len(llm_calls) == 1
+        assert sorted(llm_calls[0]) == sorted(["https://fastapi.tiangolo.com",
+                                               "https://flask.palletsprojects.com",
+                                               "https://sqlalchemy.org"])
+
+        # Nothing is due until the interval has passed
+        assert scheduler.run_due_batch() == 0
+
+        # Only the changed snippet goes back to the LLM
+        SEARCH_RESULTS["python web frameworks"][1] = SearchResult(
+            2, "Flask", "https://flask.palletsprojects.com", "Micro, now async"
+        )
+        assert scheduler.run_due_batch(now=time.time() + 3601) == 2
+        assert llm_calls[-1] == ["https://flask.palletsprojects.com"]
+
+        changes = store.changes(watch_id=first["id"])
+        assert changes[0]["changed"][0]["url"] == "https://flask.palletsprojects.com"
+    print("✅ Watchlist scheduler test passed")
+
+
+def test_summary_failure():
+    """A failed LLM call records the error and backs off without searching again"""
+    with fakes(summarize=failing_summarize):
+        store = ResearchStore(":memory:")
+        scheduler = make_scheduler(store, search_reuse_seconds=300, retry_seconds=60)
+        store.add_watch("python web frameworks", 3600, next_run_at=0)
+        store.add_watch("python orms", 3600, next_run_at=0)
+
+        now = time.time()
+        assert scheduler.run_due_batch(now=now) == 2
+        assert len(searches) == 2
+        for watch in store.list_watches():
+            assert watch["last_error"] == "Summarization failed: LLM unavailable"
+            assert watch["last_run_id"] is None
+            assert watch["next_run_at"] == now + 60
+
+        # Not retried before the backoff, then retried with the same search results
+        assert scheduler.run_due_batch(now=now + 30) == 0
+        assert scheduler.run_due_batch(now=now + 61) == 2
+        assert len(searches) == 2
+        assert all(watch["next_run_at"] == now + 61 + 120 for watch in store.list_watches())
+
+        # Once the LLM is back, the runs are recorded and the backoff resets
+        watchlist.summarize_items = fake_summarize
+        assert scheduler.run_due_batch(now=now + 182) == 2
+        assert len(searches) == 2
+        for watch in store.list_watches():
+            assert watch["last_error"] is None
+            assert watch["last_run_id"] is not None
+            assert watch["consecutive_failures"] == 0
+            assert watch["next_run_at"] == now + 182 + 3600
+    print("✅ Watchlist summarization failure test passed")
+
+
+def test_shared_url_snippets():
+    """The same URL with different snippets is summarized per snippet, in separate LLM calls"""
+    search = lambda query: {
+        "fastapi tutorial": [SearchResult(1, "FastAPI", "https://fastapi.tiangolo.com", "Tutorial")],
+        "fastapi performance": [SearchResult(1, "FastAPI", "https://fastapi.tiangolo.com", "Benchmarks")],
+    }[query]
+    with fakes(search=search):
+        store = ResearchStore(":memory:")
+        scheduler = make_scheduler(store)
+        tutorial = store.add_watch("fastapi tutorial", 3600, next_run_at=0)
+        performance = store.add_watch("fastapi performance", 3600, next_run_at=0)
+
+        assert scheduler.run_due_batch() == 2
+        assert llm_calls == [["https://fastapi.tiangolo.com"], ["https://fastapi.tiangolo.com"]]
+
+        for watch, snippet in ((tutorial, "Tutorial"), (performance, "Benchmarks")):
+            run = store.get_run(store.get_watch(watch["id"])["last_run_id"])
+            assert run["data"]["results"][0]["summary"] == f"Summary of FastAPI ({snippet})"
+            key = content_key("https://fastapi.tiangolo.com", snippet)
+            assert store.get_summaries([key])[key] == f"Summary of FastAPI ({snippet})"
+    print("✅ Watchlist shared URL test passed")
+
+
+
+def test_skipped_summaries():
+    """Results the model skipped show their snippet but aren't stored, and are asked for again"""
+    with fakes(summarize=skipping_summarize):
+        store = ResearchStore(":memory:")
+        scheduler = make_scheduler(store)
+        watch = store.add_watch("python web frameworks", 3600, next_run_at=0)
+
+        now = time.time()
+        assert scheduler.run_due_batch(now=now) == 1
+        run = store.get_run(store.get_watch(watch["id"])["last_run_id"])
+        summaries = {result["url"]: result["summary"] for result in run["data"]["results"]}
+        flask = SEARCH_RESULTS["python web frameworks"][1]
+        assert summaries[flask.link] == flask.snippet
+        assert store.get_summaries([content_key(flask.link, flask.snippet)]) == {}
+
+        # The next run only goes back to the model for the skipped result
+        watchlist.summarize_items = fake_summarize
+        assert scheduler.run_due_batch(now=now + 3601) == 1
+        assert llm_calls[-1] == [flask.link]
+    print("✅ Watchlist skipped summaries test passed")
+
+
+if __name__ == "__main__":
+    test_watchlist()
+    test_summary_failure()
+    test_shared_url_snippets()
+    test_skipped_summaries()
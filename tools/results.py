@@ -0,0 +1,86 @@
+"""
+Search result records for the Research Assistant
+Compact, slotted records holding only the fields the pipeline uses
+"""
+from dataclasses import dataclass
+from typing import Iterable, List
+from utils.config import (
+    SEARCH_MAX_RESULTS,
+    SEARCH_MAX_TITLE_CHARS,
+    SEARCH_MAX_SNIPPET_CHARS,
+    SEARCH_MAX_LINK_CHARS
+)
+
+# Ask SerpAPI to return only these fields of the organic results, instead of
+# the full response with ads, knowledge graph, images, related questions, ...
+SERPAPI_JSON_RESTRICTOR = "organic_results[].{title,link,snippet}"
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    """One organic search result"""
+    position: int
+    title: str
+    link: str
+    snippet: str
+
+    def to_dict(self) -> dict:
+        return {"position": self.position, "title": self.title, "link": self.link, "snippet": self.snippet}
+
+
+def _cap(text: str, limit: int) -> str:
+    """Truncate overly long text so a single result can't blow up memory or the prompt"""
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def parse_organic_results(response: dict, limit: int = SEARCH_MAX_RESULTS) -> List[SearchResult]:
+    """
+    Extract the top organic results from a SerpAPI response.
+
+    Only title, link and snippet are kept (capped in length), so the full
+    response can be released as soon as this returns. Results whose link is
+    longer than SEARCH_MAX_LINK_CHARS are skipped, since a truncated URL
+    would point somewhere else.
+
+    Args:
+        response: SerpAPI response dict
+        limit: Maximum number of results to keep
+
+    Returns:
+        list: SearchResult records ranked from 1
+    """
+    results = []
+    for result in response.get("organic_results", []):
+        if len(results) >= limit:
+            break
+        link = result.get("link") or "No link"
+        if len(link) > SEARCH_MAX_LINK_CHARS:
+            continue
+        results.append(SearchResult(
+            position=len(results) + 1,
+            title=_cap(result.get("title") or "No title", SEARCH_MAX_TITLE_CHARS),
+            link=link,
+            snippet=_cap(result.get("snippet") or "No snippet available", SEARCH_MAX_SNIPPET_CHARS)
+        ))
+    return results
+
+
+def results_from_dicts(items: Iterable[dict]) -> List[SearchResult]:
+    """Rebuild records from their stored dict form"""
+    return [SearchResult(**item) for item in items]
+
+
+def format_results(items: Iterable[SearchResult]) -> str:
+    """
+    Format search results as numbered text for the LLM.
+
+    Args:
+        items: SearchResult records
+
+    Returns:
+        str: One numbered block per result with title, URL and snippet
+    """
+    return "\n".join(
+        f"{item.position}. {item.title}\n   URL: {item.link}\n   {item.snippet}\n"
+        for item in items
+    )
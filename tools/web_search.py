@@ -1,46 +1,68 @@
 from langchain_core.tools import tool
 import serpapi
-from utils.config import SERPAPI_API_KEY
+from tools.results import SERPAPI_JSON_RESTRICTOR, format_results, parse_organic_results
+from utils.config import SERPAPI_API_KEY, SEARCH_MAX_RESULTS
 from utils.logger import get_logger
 
 # Get logger for this module
 logger = get_logger("tools.web_search")
 
-@tool
-def web_search(query: str) -> str:
-    """Search the web and return top 10 results with titles, links, and snippets"""
-    logger.info(f"🔍 Web search initiated for query: '{query}'")
-    try:
-        # Use modern serpapi.Client with proper parameters
-        client = serpapi.Client(api_key=SERPAPI_API_KEY)
-        results = client.search({
-            'engine': 'google',
-            'q': query
-        })
+def search_web(query: str) -> list:
+    """
+    Search the web and return the top organic results as compact records.
+    
+    Args:
+        query: The search query
         
-        formatted_results = []
+    Returns:
+        list: SearchResult records (position, title, link, snippet)
         
-        # Extract organic results
-        organic_results = results.get("organic_results", [])
+    Raises:
+        Exception: If the SerpAPI request fails
+    """
+    # Use modern serpapi.Client with proper parameters
+    client = serpapi.Client(api_key=SERPAPI_API_KEY)
+    results = client.search({
+        'engine': 'google',
+        'q': query,
+        'num': SEARCH_MAX_RESULTS,
+        # Only the organic results we use are sent back, not the whole page
+        'json_restrictor': SERPAPI_JSON_RESTRICTOR
+    })
+    
+    # Extract organic results; the response itself is dropped on return
+    return parse_organic_results(results)
+
+def run_search(query: str) -> tuple:
+    """
+    Search the web, returning both the structured results and the LLM-ready text.
+    
+    Errors and empty result sets are reported in the text rather than raised,
+    matching the behaviour of the web_search tool.
+    
+    Args:
+        query: The search query
         
-        if organic_results:
-            for i, result in enumerate(organic_results[:10], 1):
-                title = result.get("title", "No title")
-                link = result.get("link", "No link")
-                snippet = result.get("snippet", "No snippet available")
-                
-                formatted_results.append(
-                    f"{i}. {title}\n   URL: {link}\n   {snippet}\n"
-                )
+    Returns:
+        tuple: (list of SearchResult records, formatted text)
+    """
+    logger.info(f"🔍 Web search initiated for query: '{query}'")
+    try:
+        items = search_web(query)
         
-        if formatted_results:
-            result_text = "\n".join(formatted_results)
-            logger.info(f"✅ Web search completed: Found {len(formatted_results)} results")
-            logger.debug(f"Search results: {result_text[:200]}...")  # Log first 200 chars
-            return result_text
+        if items:
+            result_text = format_results(items)
+            logger.info(f"✅ Web search completed: Found {len(items)} results")
+            logger.debug("Search results: %.200s...", result_text)  # Log first 200 chars, formatted lazily
+            return items, result_text
         else:
             logger.warning("No results found for the query")
-            return "No results found for the query."
+            return [], "No results found for the query."
     except Exception as e:
         logger.error(f"❌ Error performing search: {str(e)}")
-        return f"Error performing search: {str(e)}"
\ No newline at end of file
+        return [], f"Error performing search: {str(e)}"
+
+@tool
+def web_search(query: str) -> str:
+    """Search the web and return top 10 results with titles, links, and snippets"""
+    return run_search(query)[1]
\ No newline at end of file
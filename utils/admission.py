@@ -0,0 +1,207 @@
+"""
+Admission control for the Research Agent API
+Limits concurrent research runs, queues excess requests by priority and
+sheds load early (with a Retry-After hint) when the queue would take too long
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+from utils.logger import get_logger
+
+# Get logger for this module
+logger = get_logger("utils.admission")
+
+# Lower value = served first
+PRIORITIES = {"interactive": 0, "batch": 1}
+
+# Weight of the newest sample in the moving average of service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+class Rejected(Exception):
+    """A request was shed instead of being admitted"""
+
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(f"Request shed ({reason}), retry after {retry_after:.0f}s")
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """
+    Priority admission control for research requests.
+
+    At most `max_in_flight` requests run at once. Others wait in a priority
+    queue (interactive before batch, FIFO within a class). A request is
+    rejected immediately if the queue is full (429), or if its estimated wait
+    (from the moving average of service time) exceeds its class's queue-time
+    budget (503). Requests still waiting when their budget runs out are also
+    rejected (503). Every rejection carries a Retry-After estimate.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        max_queue_time: Dict[str, float],
+        initial_service_time: float = 5.0
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_time = max_queue_time
+        self.avg_service_time = initial_service_time
+        self.in_flight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._queued = {name: 0 for name in PRIORITIES}
+        # Metrics
+        self._admitted = {name: 0 for name in PRIORITIES}
+        self._shed = {name: {} for name in PRIORITIES}
+        self._queue_time = {name: {"count": 0, "total": 0.0, "max": 0.0} for name in PRIORITIES}
+        self._degraded = 0
+        self._completed = 0
+
+    def estimated_wait(self, priority: str) -> float:
+        """Expected queue time for a new request of this priority"""
+        rank = PRIORITIES[priority]
+        ahead = sum(count for name, count in self._queued.items() if PRIORITIES[name] <= rank)
+        if self.in_flight < self.max_in_flight and ahead == 0:
+            return 0.0
+        # With every slot busy, one frees up every avg_service_time / max_in_flight seconds
+        return (ahead + 1) * self.avg_service_time / self.max_in_flight
+
+    def _shed_request(self, priority: str, status_code: int, reason: str, retry_after: float) -> Rejected:
+        self._shed[priority][reason] = self._shed[priority].get(reason, 0) + 1
+        logger.warning(f"🚦 Shedding {priority} request ({reason}), retry after {retry_after:.1f}s")
+        return Rejected(status_code, reason, retry_after)
+
+    def _record_admission(self, priority: str, queue_time: float):
+        self._admitted[priority] += 1
+        stats = self._queue_time[priority]
+        stats["count"] += 1
+        stats["total"] += queue_time
+        stats["max"] = max(stats["max"], queue_time)
+
+    async def acquire(self, priority: str) -> float:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: One of PRIORITIES
+
+        Returns:
+            float: Seconds spent queued
+
+        Raises:
+            Rejected: If the request is shed
+        """
+        wait = self.estimated_wait(priority)
+        if wait == 0.0:
+            self.in_flight += 1
+            self._record_admission(priority, 0.0)
+            return 0.0
+
+        if sum(self._queued.values()) >= self.max_queue:
+            raise self._shed_request(priority, 429, "queue_full", wait)
+        budget = self.max_queue_time[priority]
+        if wait > budget:
+            raise self._shed_request(priority, 503, "estimated_wait", wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES[priority], next(self._sequence), future, priority))
+        self._queued[priority] += 1
+        enqueued = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=budget)
+        except asyncio.TimeoutError:
+            if not future.done() or future.cancelled():
+                # The heap entry is skipped lazily in release() since its future is done
+                self._queued[priority] -= 1
+                raise self._shed_request(priority, 503, "queue_timeout", self.estimated_wait(priority))
+            # The slot was handed over just as the budget ran out - keep it
+        except asyncio.CancelledError:
+            # Client went away while queued. If the slot was already handed
+            # over, give it back so it isn't leaked
+            if future.done() and not future.cancelled():
+                self.release(None)
+            else:
+                self._queued[priority] -= 1
+            raise
+
+        queue_time = time.monotonic() - enqueued
+        self._record_admission(priority, queue_time)
+        return queue_time
+
+    def release(self, service_time: Optional[float]):
+        """Free a slot and hand it to the highest-priority waiter"""
+        self._completed += 1
+        if service_time is not None:
+            self.avg_service_time += SERVICE_TIME_ALPHA * (service_time - self.avg_service_time)
+        while self._waiters:
+            _, _, future, priority = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+            # The slot passes straight to the waiter, so in_flight is unchanged
+            self._queued[priority] -= 1
+            future.set_result(None)
+            return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: str):
+        """Hold a slot for the duration of the block, yielding the queue time"""
+        queue_time = await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield queue_time
+        finally:
+            self.release(time.monotonic() - started)
+
+    def record_degraded(self):
+        """Count a shed request that was answered from cache instead"""
+        self._degraded += 1
+
+    def metrics(self) -> dict:
+        """Snapshot of admission metrics for capacity planning"""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": dict(self._queued),
+            "max_queue": self.max_queue,
+            "avg_service_time": round(self.avg_service_time, 3),
+            "estimated_wait": {name: round(self.estimated_wait(name), 3) for name in PRIORITIES},
+            "admitted": dict(self._admitted),
+            "shed": {name: dict(reasons) for name, reasons in self._shed.items()},
+            "degraded_responses": self._degraded,
+            "completed": self._completed,
+            "queue_time": {
+                name: {
+                    "count": stats["count"],
+                    "mean": round(stats["total"] / stats["count"], 3) if stats["count"] else 0.0,
+                    "max": round(stats["max"], 3),
+                }
+                for name, stats in self._queue_time.items()
+            },
+        }
+
+
+def parse_api_key_priorities(raw: str) -> Dict[str, str]:
+    """
+    Parse "key1:interactive,key2:batch" into a mapping of API key to priority
+
+    Raises:
+        ValueError: If an entry is malformed or names an unknown priority
+    """
+    mapping = {}
+    for entry in filter(None, (part.strip() for part in (raw or "").split(","))):
+        key, sep, priority = entry.rpartition(":")
+        if not sep or not key or priority not in PRIORITIES:
+            raise ValueError(f"Invalid API_KEY_PRIORITIES entry: '{entry}'")
+        mapping[key] = priority
+    return mapping
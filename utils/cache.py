@@ -0,0 +1,55 @@
+"""
+In-memory result cache for the Research Assistant
+A small thread-safe LRU cache with per-entry expiry
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a research query into a cache key
+    
+    Queries that differ only in case or whitespace map to the same key.
+    """
+    return " ".join(query.lower().split())
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after `ttl` seconds"""
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
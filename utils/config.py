@@ -1,4 +1,5 @@
 from dotenv import load_dotenv
+import json
 import os
 
 load_dotenv()
@@ -17,6 +18,120 @@ LLAMA_MODEL_NAME = os.getenv("LLAMA_MODEL_NAME", "meta-llama/Llama-3.3-70B-Instr
 DEFAULT_TEMPERATURE = float(os.getenv("DEFAULT_TEMPERATURE", "0.7"))
 DEFAULT_MAX_TOKENS = int(os.getenv("DEFAULT_MAX_TOKENS", "2048"))
 
+
+def _env_bool(name: str, default: str = "false") -> bool:
+    """Read a boolean flag from the environment ("1", "true", "yes" are truthy)"""
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _parse_llm_backends(raw: str) -> list:
+    """
+    Parse the LLM_BACKENDS setting into a list of backend dicts.
+
+    LLM_BACKENDS is a JSON list of OpenAI-compatible endpoints, e.g.
+    [{"name": "hf", "base_url": "https://router.huggingface.co/v1", "weight": 2},
+     {"name": "local", "base_url": "http://vllm:8000/v1", "api_key": "x", "model": "llama"}]
+
+    Missing fields fall back to the single-backend settings above. When
+    LLM_BACKENDS is unset, the HuggingFace endpoint is the only backend.
+    """
+    if not raw:
+        entries = [{"name": "huggingface"}]
+    else:
+        try:
+            entries = json.loads(raw)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"LLM_BACKENDS is not valid JSON: {e}")
+        if not isinstance(entries, list) or not entries:
+            raise ValueError("LLM_BACKENDS must be a non-empty JSON list")
+
+    backends = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"LLM_BACKENDS entry {i} must be a JSON object")
+        backends.append({
+            "name": entry.get("name", f"backend-{i}"),
+            "base_url": entry.get("base_url", HUGGINGFACE_API_BASE),
+            "api_key": entry.get("api_key", HUGGINGFACE_API_KEY),
+            "model": entry.get("model", LLAMA_MODEL_NAME),
+            "weight": float(entry.get("weight", 1.0)),
+        })
+    return backends
+
+
+# LLM Backend Pool - failover, load balancing and hedged requests
+LLM_BACKENDS = _parse_llm_backends(os.getenv("LLM_BACKENDS"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+# A backend is taken out of rotation after this many consecutive failures...
+LLM_FAILURE_THRESHOLD = int(os.getenv("LLM_FAILURE_THRESHOLD", "3"))
+# ...for this many seconds, after which it gets another chance
+LLM_BACKEND_COOLDOWN = float(os.getenv("LLM_BACKEND_COOLDOWN", "30"))
+# Hedging: if the first token hasn't arrived within the backend's p95
+# time-to-first-token, fire the same request at another backend
+LLM_HEDGE_ENABLED = _env_bool("LLM_HEDGE_ENABLED")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MIN_DELAY = float(os.getenv("LLM_HEDGE_MIN_DELAY", "0.5"))
+LLM_HEDGE_DEFAULT_DELAY = float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "3.0"))
+# At most this fraction of requests is hedged, so a slow backend can't double the load
+LLM_HEDGE_MAX_RATIO = float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.05"))
+
+# API Response Settings
+# Responses smaller than this many bytes are sent uncompressed
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1000"))
+# Completed research results are cached (and served with ETags) for this long
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "3600"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+
+# Research Store - SQLite history of every run (set to an empty string to disable)
+RESEARCH_STORE_PATH = os.getenv("RESEARCH_STORE_PATH", "data/research.db")
+# Runs and per-URL summaries unused for this many days are deleted (0 keeps everything)
+RESEARCH_RETENTION_DAYS = float(os.getenv("RESEARCH_RETENTION_DAYS", "30"))
+
+# Watchlist Scheduler - recurring research queries run inside the API service
+WATCHLIST_ENABLED = _env_bool("WATCHLIST_ENABLED", "true")
+# How often the scheduler looks for due queries, and how many it takes at once
+WATCHLIST_TICK_SECONDS = float(os.getenv("WATCHLIST_TICK_SECONDS", "30"))
+WATCHLIST_BATCH_SIZE = int(os.getenv("WATCHLIST_BATCH_SIZE", "50"))
+WATCHLIST_MIN_INTERVAL = float(os.getenv("WATCHLIST_MIN_INTERVAL", "300"))
+# New watches get a random first-run offset up to this many seconds
+WATCHLIST_SPREAD_SECONDS = float(os.getenv("WATCHLIST_SPREAD_SECONDS", "60"))
+WATCHLIST_SEARCH_CONCURRENCY = int(os.getenv("WATCHLIST_SEARCH_CONCURRENCY", "4"))
+# Search results stored less than this many seconds ago are reused instead of searching again
+WATCHLIST_SEARCH_REUSE_SECONDS = float(os.getenv("WATCHLIST_SEARCH_REUSE_SECONDS", "300"))
+# Changed results from all due queries are summarized this many per LLM call
+WATCHLIST_SUMMARY_BATCH_SIZE = int(os.getenv("WATCHLIST_SUMMARY_BATCH_SIZE", "10"))
+# A failed run is retried after this many seconds, doubling per consecutive failure up to the watch's interval
+WATCHLIST_RETRY_SECONDS = float(os.getenv("WATCHLIST_RETRY_SECONDS", "60"))
+# Upstream quotas the scheduler stays within
+SERPAPI_MAX_PER_MINUTE = float(os.getenv("SERPAPI_MAX_PER_MINUTE", "30"))
+LLM_MAX_PER_MINUTE = float(os.getenv("LLM_MAX_PER_MINUTE", "30"))
+
+# CLI - stored results younger than this are reused as-is, older ones are refreshed
+CLI_CACHE_TTL = float(os.getenv("CLI_CACHE_TTL", "86400"))
+CLI_CONCURRENCY = int(os.getenv("CLI_CONCURRENCY", "4"))
+
+# Admission Control - limits concurrent research runs in the API and sheds excess load
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "8"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+# Longest a request of each priority class may wait for a slot before it is shed
+ADMISSION_MAX_QUEUE_TIME_INTERACTIVE = float(os.getenv("ADMISSION_MAX_QUEUE_TIME_INTERACTIVE", "10"))
+ADMISSION_MAX_QUEUE_TIME_BATCH = float(os.getenv("ADMISSION_MAX_QUEUE_TIME_BATCH", "60"))
+# Service time assumed for wait estimates until real runs have been measured
+ADMISSION_INITIAL_SERVICE_TIME = float(os.getenv("ADMISSION_INITIAL_SERVICE_TIME", "5"))
+# Priority for requests without an X-Priority header or a mapped API key
+ADMISSION_DEFAULT_PRIORITY = os.getenv("ADMISSION_DEFAULT_PRIORITY", "interactive")
+# Comma separated "api_key:priority" pairs, matched against the X-API-Key header
+API_KEY_PRIORITIES = os.getenv("API_KEY_PRIORITIES", "")
+# Answer shed requests from cached/stored results (marked "degraded") when available
+ADMISSION_DEGRADED_RESPONSES = _env_bool("ADMISSION_DEGRADED_RESPONSES", "true")
+
+# Search Ingestion - bounds on what is kept from each search (per-request memory cap)
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "10"))
+SEARCH_MAX_TITLE_CHARS = int(os.getenv("SEARCH_MAX_TITLE_CHARS", "200"))
+SEARCH_MAX_SNIPPET_CHARS = int(os.getenv("SEARCH_MAX_SNIPPET_CHARS", "500"))
+# Results with a longer URL are skipped (a truncated URL would be wrong)
+SEARCH_MAX_LINK_CHARS = int(os.getenv("SEARCH_MAX_LINK_CHARS", "2048"))
+
 # Validate required API keys
 def validate_config():
     """Validate that all required API keys are present"""
@@ -25,7 +140,7 @@ def validate_config():
     if not SERPAPI_API_KEY:
         missing_keys.append("SERPAPI_API_KEY")
     
-    if not HUGGINGFACE_API_KEY:
+    if not HUGGINGFACE_API_KEY and not all(b["api_key"] for b in LLM_BACKENDS):
         missing_keys.append("HUGGINGFACE_API_KEY")
     
     if missing_keys:
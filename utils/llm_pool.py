@@ -0,0 +1,341 @@
+"""
+LLM backend pool for the Research Assistant
+Spreads LLM calls across several OpenAI-compatible backends with health
+tracking, weighted load balancing, automatic failover and hedged requests
+"""
+import asyncio
+import math
+import random
+import threading
+import time
+from collections import deque
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage
+from langchain_openai import ChatOpenAI
+from utils.config import (
+    LLM_BACKENDS,
+    LLM_REQUEST_TIMEOUT,
+    LLM_FAILURE_THRESHOLD,
+    LLM_BACKEND_COOLDOWN,
+    LLM_HEDGE_ENABLED,
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_DELAY,
+    LLM_HEDGE_DEFAULT_DELAY,
+    LLM_HEDGE_MAX_RATIO,
+    DEFAULT_TEMPERATURE,
+    DEFAULT_MAX_TOKENS
+)
+from utils.logger import get_logger
+
+# Get logger for this module
+logger = get_logger("utils.llm_pool")
+
+# Number of recent time-to-first-token samples kept per backend
+LATENCY_WINDOW = 200
+# Minimum samples before the percentile is trusted for hedging
+MIN_LATENCY_SAMPLES = 10
+
+
+class Backend:
+    """A single OpenAI-compatible endpoint plus its health statistics"""
+
+    def __init__(self, name: str, llm, weight: float = 1.0):
+        self.name = name
+        self.llm = llm
+        self.weight = max(weight, 0.0)
+        self._lock = threading.Lock()
+        self._ttft = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.unhealthy_until = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.in_flight = 0
+
+    def is_healthy(self, now: Optional[float] = None) -> bool:
+        """A backend is healthy unless it is cooling down after repeated failures"""
+        return (now or time.monotonic()) >= self.unhealthy_until
+
+    def record_first_token(self, seconds: float):
+        """Record time-to-first-token (a lower bound for streams cancelled before it)"""
+        with self._lock:
+            self._ttft.append(seconds)
+
+    def record_success(self):
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self.unhealthy_until = 0.0
+
+    def record_failure(self, cooldown: float, threshold: int):
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= threshold:
+                self.unhealthy_until = time.monotonic() + cooldown
+                logger.warning(
+                    f"⚠️ LLM backend '{self.name}' marked unhealthy for {cooldown:.0f}s "
+                    f"after {self.consecutive_failures} consecutive failures"
+                )
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Return the p-th percentile of time-to-first-token, or None if too few samples"""
+        with self._lock:
+            samples = sorted(self._ttft)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        index = min(len(samples) - 1, max(0, math.ceil(p / 100 * len(samples)) - 1))
+        return samples[index]
+
+    def stats(self) -> dict:
+        """Snapshot of the backend's health for monitoring"""
+        p50 = self.percentile(50)
+        p95 = self.percentile(95)
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "healthy": self.is_healthy(),
+            "in_flight": self.in_flight,
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "ttft_p50": round(p50, 3) if p50 is not None else None,
+            "ttft_p95": round(p95, 3) if p95 is not None else None,
+        }
+
+
+class _Attempt:
+    """One streaming request against one backend"""
+
+    def __init__(self, backend: Backend):
+        self.backend = backend
+        self.task = None
+        self.failed = False
+
+
+class LLMPool:
+    """
+    Routes LLM calls across a set of backends.
+
+    Each call streams from a backend chosen by weighted random selection among
+    healthy backends. If the call fails, it is retried on another backend. With
+    hedging enabled, when no token has arrived within the backend's
+    time-to-first-token percentile, a second request is sent to another
+    backend; whichever produces a token first wins and the other is cancelled.
+    At most `hedge_max_ratio` of requests are hedged, so a backend that slows
+    down across the board doesn't double the load on the others.
+
+    Requests stream with `astream` on an event loop owned by the pool, so a
+    losing request is cancelled outright (closing its HTTP connection) even
+    while it is still waiting for its first token.
+    """
+
+    def __init__(
+        self,
+        backends: List[Backend],
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_delay: float = 0.5,
+        hedge_default_delay: float = 3.0,
+        hedge_max_ratio: float = 0.05,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+        rng: Optional[random.Random] = None
+    ):
+        if not backends:
+            raise ValueError("LLMPool needs at least one backend")
+        self.backends = backends
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.hedge_max_ratio = hedge_max_ratio
+        # Only touched on the pool's event loop
+        self._requests = 0
+        self._hedges = 0
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._random = rng or random.Random()
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name="llm-pool", daemon=True).start()
+
+    def _pick(self, exclude) -> Optional[Backend]:
+        """Weighted random choice among healthy backends not yet tried"""
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b not in exclude]
+        if not candidates:
+            return None
+        healthy = [b for b in candidates if b.is_healthy(now) and b.weight > 0]
+        if not healthy:
+            # Everything is cooling down: try whichever recovers soonest
+            return min(candidates, key=lambda b: b.unhealthy_until)
+        return self._random.choices(healthy, weights=[b.weight for b in healthy])[0]
+
+    def _hedge_delay(self, backend: Backend) -> float:
+        threshold = backend.percentile(self.hedge_percentile)
+        if threshold is None:
+            threshold = self.hedge_default_delay
+        return max(threshold, self.hedge_min_delay)
+
+    async def _stream(self, attempt: _Attempt, messages, events: asyncio.Queue) -> str:
+        """Run one streaming request, reporting the first token (or error) on `events`"""
+        backend = attempt.backend
+        backend.in_flight += 1
+        started = time.monotonic()
+        first_token = False
+        parts = []
+        try:
+            async for chunk in backend.llm.astream(messages):
+                if not first_token:
+                    first_token = True
+                    backend.record_first_token(time.monotonic() - started)
+                    events.put_nowait(("first_token", attempt, None))
+                parts.append(chunk.content)
+            if not first_token:
+                events.put_nowait(("first_token", attempt, None))
+            backend.record_success()
+            return "".join(parts)
+        except asyncio.CancelledError:
+            # Lost the hedge race - not a backend failure. Its time so far is a
+            # lower bound on its time-to-first-token; dropping it would bias the
+            # percentile towards the fast requests and make hedging trigger earlier
+            if not first_token:
+                backend.record_first_token(time.monotonic() - started)
+            raise
+        except Exception as e:
+            attempt.failed = True
+            backend.record_failure(self.cooldown, self.failure_threshold)
+            if not first_token:
+                events.put_nowait(("error", attempt, e))
+            raise
+        finally:
+            backend.in_flight -= 1
+
+    def _launch(self, backend: Backend, messages, events: asyncio.Queue) -> _Attempt:
+        attempt = _Attempt(backend)
+        attempt.task = asyncio.ensure_future(self._stream(attempt, messages, events))
+        return attempt
+
+    async def _run(self, primary: Backend, messages, tried: set) -> str:
+        """Run a request on `primary`, hedging to another backend if it is slow"""
+        events = asyncio.Queue()
+        attempts = [self._launch(primary, messages, events)]
+        self._requests += 1
+        can_hedge = self.hedge_enabled
+        delay = self._hedge_delay(primary)
+
+        try:
+            while True:
+                try:
+                    kind, attempt, error = await asyncio.wait_for(events.get(), timeout=delay if can_hedge else None)
+                except asyncio.TimeoutError:
+                    can_hedge = False
+                    if self._hedges >= self.hedge_max_ratio * self._requests:
+                        logger.debug(f"Hedge budget used up, waiting on '{primary.name}'")
+                        continue
+                    secondary = self._pick(tried)
+                    if secondary is not None:
+                        tried.add(secondary)
+                        self._hedges += 1
+                        logger.info(
+                            f"⏱️ No first token from '{primary.name}' after {delay:.2f}s, "
+                            f"hedging to '{secondary.name}'"
+                        )
+                        attempts.append(self._launch(secondary, messages, events))
+                    continue
+
+                if kind == "first_token":
+                    for other in attempts:
+                        if other is not attempt:
+                            other.task.cancel()
+                    if attempt.backend is not primary:
+                        logger.info(f"🏁 Hedged request won by '{attempt.backend.name}'")
+                    return await attempt.task
+
+                logger.warning(f"❌ LLM backend '{attempt.backend.name}' failed: {error}")
+                if all(a.failed for a in attempts):
+                    raise error
+        finally:
+            # Nothing outlives the call, whether it returned, failed or was cancelled
+            for attempt in attempts:
+                attempt.task.cancel()
+
+    async def _invoke(self, messages) -> str:
+        tried = set()
+        last_error = None
+        while True:
+            backend = self._pick(tried)
+            if backend is None:
+                break
+            tried.add(backend)
+            try:
+                return await self._run(backend, messages, tried)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"🔁 Failing over after error from '{backend.name}': {e}")
+        raise last_error or RuntimeError("No LLM backend available")
+
+    def invoke(self, messages) -> AIMessage:
+        """
+        Send messages to the pool and return the model's reply.
+
+        Args:
+            messages: Anything a LangChain chat model accepts (prompt value, message list)
+
+        Returns:
+            AIMessage: The completed response from whichever backend answered
+        """
+        future = asyncio.run_coroutine_threadsafe(self._invoke(messages), self._loop)
+        return AIMessage(content=future.result())
+
+    def stats(self) -> list:
+        """Health statistics for every backend"""
+        return [b.stats() for b in self.backends]
+
+
+def build_pool() -> LLMPool:
+    """Create an LLMPool from the LLM_* configuration settings"""
+    # Failover is handled by the pool, so only let the client retry on its own
+    # when there is no other backend to fail over to
+    max_retries = 2 if len(LLM_BACKENDS) == 1 else 0
+    backends = [
+        Backend(
+            name=cfg["name"],
+            llm=ChatOpenAI(
+                model=cfg["model"],
+                temperature=DEFAULT_TEMPERATURE,
+                max_tokens=DEFAULT_MAX_TOKENS,
+                base_url=cfg["base_url"],
+                api_key=cfg["api_key"],
+                timeout=LLM_REQUEST_TIMEOUT,
+                max_retries=max_retries
+            ),
+            weight=cfg["weight"]
+        )
+        for cfg in LLM_BACKENDS
+    ]
+    logger.info(f"LLM pool configured with {len(backends)} backend(s): "
+                f"{', '.join(b.name for b in backends)} (hedging {'on' if LLM_HEDGE_ENABLED else 'off'})")
+    return LLMPool(
+        backends,
+        hedge_enabled=LLM_HEDGE_ENABLED,
+        hedge_percentile=LLM_HEDGE_PERCENTILE,
+        hedge_min_delay=LLM_HEDGE_MIN_DELAY,
+        hedge_default_delay=LLM_HEDGE_DEFAULT_DELAY,
+        hedge_max_ratio=LLM_HEDGE_MAX_RATIO,
+        failure_threshold=LLM_FAILURE_THRESHOLD,
+        cooldown=LLM_BACKEND_COOLDOWN
+    )
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_llm_pool() -> LLMPool:
+    """Return the shared LLM pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = build_pool()
+        return _pool
@@ -0,0 +1,41 @@
+"""
+Rate limiting utility for the Research Assistant
+Token bucket used to keep upstream calls within their quotas
+"""
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `per_minute` calls per minute.
+    
+    Calls are spread evenly: after the initial burst is used up, acquire()
+    waits until the next token is due rather than letting calls bunch up.
+    """
+    
+    def __init__(self, per_minute: float, burst: int = 1):
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """Block until a call is allowed"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
@@ -0,0 +1,70 @@
+"""
+Serialization helpers for API responses
+Fast JSON encoding (orjson when installed) and ETag handling
+"""
+import hashlib
+import json
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - fall back to the standard library
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """
+    Serialize an object to compact JSON bytes
+    
+    Args:
+        obj: JSON-compatible object (dicts, lists, strings, numbers)
+        
+    Returns:
+        bytes: UTF-8 encoded JSON without extra whitespace
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """
+    Parse JSON from str or bytes
+    
+    Raises:
+        json.JSONDecodeError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Compute a weak ETag for a response body
+    
+    Weak, because responses may be sent brotli or gzip encoded under the same
+    tag, and strong validators must differ between content encodings.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+    
+    Args:
+        if_none_match: Raw header value (may be '*' or a comma separated list)
+        etag: The current ETag of the resource
+        
+    Returns:
+        bool: True if the client's cached copy is still current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison is sufficient for GET, so ignore W/ prefixes
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in candidates
@@ -0,0 +1,431 @@
+"""
+Persistent research store for the Research Assistant
+Keeps every research run in SQLite, with per-URL summaries stored once
+and addressed by the hash of the content they summarize
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from utils.cache import normalize_query
+from utils.config import RESEARCH_STORE_PATH, RESEARCH_RETENTION_DAYS
+from utils.logger import get_logger
+
+# Get logger for this module
+logger = get_logger("utils.store")
+
+# Minimum time between automatic retention passes
+PRUNE_INTERVAL = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT NOT NULL,
+    query_key TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    search_results TEXT NOT NULL,
+    result TEXT NOT NULL,
+    summarized INTEGER NOT NULL DEFAULT 0,
+    reused INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_query_key_created ON runs (query_key, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at DESC);
+
+CREATE TABLE IF NOT EXISTS url_summaries (
+    content_key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    snippet TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_url_summaries_url ON url_summaries (url);
+CREATE INDEX IF NOT EXISTS idx_url_summaries_last_used ON url_summaries (last_used_at);
+
+CREATE TABLE IF NOT EXISTS watchlist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    query TEXT NOT NULL,
+    query_key TEXT NOT NULL UNIQUE,
+    interval_seconds REAL NOT NULL,
+    created_at REAL NOT NULL,
+    next_run_at REAL NOT NULL,
+    last_run_id INTEGER,
+    last_run_at REAL,
+    last_error TEXT,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_watchlist_next_run ON watchlist (next_run_at);
+
+CREATE TABLE IF NOT EXISTS watch_changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    watch_id INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    added TEXT NOT NULL,
+    removed TEXT NOT NULL,
+    changed TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_watch_changes_watch_created ON watch_changes (watch_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_watch_changes_created ON watch_changes (created_at DESC);
+"""
+
+
+def content_key(url: str, snippet: str) -> str:
+    """
+    Content address of a search result
+
+    The key changes whenever the URL or its snippet changes, so a stored
+    summary is only reused while the result it summarizes is unchanged.
+    """
+    return hashlib.sha256(f"{url}\0{snippet}".encode("utf-8")).hexdigest()
+
+
+class ResearchStore:
+    """
+    SQLite-backed history of research runs and per-URL summaries
+
+    With a retention period, runs older than it and summaries not used within
+    it are pruned automatically (at most once per PRUNE_INTERVAL) as new runs
+    are recorded.
+    """
+
+    def __init__(self, path: str, retention_seconds: float = 0):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self._last_prune = 0.0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            # Stores created before watch retries were tracked
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(watchlist)")}
+            if "consecutive_failures" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE watchlist ADD COLUMN consecutive_failures INTEGER NOT NULL DEFAULT 0"
+                )
+                self._conn.commit()
+        logger.info(f"Research store opened at {path}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_summaries(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up stored summaries by content key
+
+        Args:
+            keys: Content keys as returned by content_key()
+
+        Returns:
+            Dict mapping each found content key to its summary
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT content_key, summary FROM url_summaries WHERE content_key IN ({placeholders})",
+                keys
+            ).fetchall()
+            if rows:
+                self._conn.execute(
+                    f"UPDATE url_summaries SET last_used_at = ? WHERE content_key IN ({placeholders})",
+                    [time.time(), *keys]
+                )
+                self._conn.commit()
+        return {row["content_key"]: row["summary"] for row in rows}
+
+    def record_run(
+        self,
+        query: str,
+        items: List[dict],
+        result_data: dict,
+        mode: str = "full",
+        summarized: Optional[int] = None,
+        reused: int = 0,
+        new_summaries: Optional[Dict[str, str]] = None
+    ) -> int:
+        """
+        Store a completed research run and the per-URL summaries it produced
+
+        Args:
+            query: The research query as entered
+            items: SearchResult records
+            result_data: The summarized results ({"results": [...]})
+            mode: 'full' for a normal run, 'refresh' for an incremental one
+            summarized: Number of URLs the LLM summarized in this run
+                (defaults to the number of summaries stored)
+            reused: Number of URLs whose stored summary was reused
+            new_summaries: Mapping of URL to the summaries the LLM wrote in
+                this run, the only ones stored for reuse. Defaults to every
+                summary in result_data (a full run). Snippets used as fallback
+                summaries must be left out, or they would be reused as if the
+                model had written them.
+
+        Returns:
+            int: The id of the new run
+        """
+        now = time.time()
+        if new_summaries is None:
+            new_summaries = {
+                result.get("url"): result.get("summary") for result in result_data.get("results", [])
+            }
+        snippets = {item.link: item for item in items}
+        summary_rows = []
+        for url, summary in new_summaries.items():
+            item = snippets.get(url)
+            if item is None or not summary:
+                continue
+            summary_rows.append((
+                content_key(item.link, item.snippet),
+                item.link, item.title, item.snippet, summary, now, now
+            ))
+        if summarized is None:
+            summarized = len(summary_rows)
+
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (query, query_key, mode, created_at, search_results, result, summarized, reused) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (query, normalize_query(query), mode, now, json.dumps([item.to_dict() for item in items]),
+                 json.dumps(result_data), summarized, reused)
+            )
+            self._conn.executemany(
+                "INSERT INTO url_summaries (content_key, url, title, snippet, summary, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(content_key) DO UPDATE SET summary = excluded.summary, last_used_at = excluded.last_used_at",
+                summary_rows
+            )
+            self._conn.commit()
+        logger.info(f"💾 Stored {mode} run #{cursor.lastrowid} for '{query}' ({len(summary_rows)} URL summaries)")
+        if self.retention_seconds and now - self._last_prune >= PRUNE_INTERVAL:
+            self._last_prune = now
+            self.prune(self.retention_seconds)
+        return cursor.lastrowid
+
+    def prune(self, max_age: float) -> Dict[str, int]:
+        """
+        Delete runs and watch changes older than `max_age` seconds, and
+        summaries not looked up or stored within it
+
+        A watch's latest run is kept, since the next run is compared with it.
+
+        Returns:
+            Dict with the number of deleted runs, changes and summaries
+        """
+        cutoff = time.time() - max_age
+        with self._lock:
+            runs = self._conn.execute(
+                "DELETE FROM runs WHERE created_at < ? AND id NOT IN "
+                "(SELECT last_run_id FROM watchlist WHERE last_run_id IS NOT NULL)",
+                (cutoff,)
+            ).rowcount
+            changes = self._conn.execute("DELETE FROM watch_changes WHERE created_at < ?", (cutoff,)).rowcount
+            summaries = self._conn.execute("DELETE FROM url_summaries WHERE last_used_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        if runs or changes or summaries:
+            logger.info(f"🧹 Pruned {runs} runs, {changes} watch changes and {summaries} URL summaries")
+        return {"runs": runs, "changes": changes, "summaries": summaries}
+
+    def latest_run(self, query: str) -> Optional[dict]:
+        """Return the most recent run for a query, including raw search results"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM runs WHERE query_key = ? ORDER BY created_at DESC LIMIT 1",
+                (normalize_query(query),)
+            ).fetchone()
+        return self._row_to_run(row, include_raw=True) if row else None
+
+    def history(
+        self,
+        query: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 50,
+        include_raw: bool = False
+    ) -> List[dict]:
+        """
+        List stored runs, newest first
+
+        Args:
+            query: Only runs for this query (compared after normalization)
+            since: Only runs created at or after this Unix timestamp
+            limit: Maximum number of runs to return
+            include_raw: Include the raw search results of each run
+
+        Returns:
+            List of run dicts
+        """
+        clauses, params = [], []
+        if query:
+            clauses.append("query_key = ?")
+            params.append(normalize_query(query))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM runs {where} ORDER BY created_at DESC LIMIT ?", params
+            ).fetchall()
+        return [self._row_to_run(row, include_raw) for row in rows]
+
+    def get_run(self, run_id: int) -> Optional[dict]:
+        """Return a single run by id, including raw search results"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._row_to_run(row, include_raw=True) if row else None
+
+    def add_watch(self, query: str, interval_seconds: float, next_run_at: float) -> dict:
+        """
+        Register a recurring query, or update the interval of an existing one
+
+        Args:
+            query: The research query to run on a schedule
+            interval_seconds: Time between runs
+            next_run_at: Unix timestamp of the first run
+
+        Returns:
+            The watch as a dict
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watchlist (query, query_key, interval_seconds, created_at, next_run_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(query_key) DO UPDATE SET interval_seconds = excluded.interval_seconds",
+                (query, normalize_query(query), interval_seconds, time.time(), next_run_at)
+            )
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT * FROM watchlist WHERE query_key = ?", (normalize_query(query),)
+            ).fetchone()
+        return dict(row)
+
+    def get_watch(self, watch_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM watchlist WHERE id = ?", (watch_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_watches(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM watchlist ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def remove_watch(self, watch_id: int) -> bool:
+        """Delete a watch and its change history. Returns False if it did not exist"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM watchlist WHERE id = ?", (watch_id,))
+            self._conn.execute("DELETE FROM watch_changes WHERE watch_id = ?", (watch_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def due_watches(self, now: float, limit: int) -> List[dict]:
+        """Return up to `limit` watches whose next run is due, most overdue first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM watchlist WHERE next_run_at <= ? ORDER BY next_run_at LIMIT ?",
+                (now, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def mark_watch_run(self, watch_id: int, next_run_at: float, run_id: Optional[int] = None,
+                       error: Optional[str] = None):
+        """Schedule a watch's next run and record the outcome of this one (a run, or an error)"""
+        with self._lock:
+            if run_id is None:
+                self._conn.execute(
+                    "UPDATE watchlist SET next_run_at = ?, last_error = ?, "
+                    "consecutive_failures = consecutive_failures + 1 WHERE id = ?",
+                    (next_run_at, error, watch_id)
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE watchlist SET next_run_at = ?, last_run_id = ?, last_run_at = ?, last_error = NULL, "
+                    "consecutive_failures = 0 WHERE id = ?",
+                    (next_run_at, run_id, time.time(), watch_id)
+                )
+            self._conn.commit()
+
+    def record_changes(self, watch_id: int, run_id: int, added: list, removed: list, changed: list):
+        """Store how a watched query's results differ from its previous run"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO watch_changes (watch_id, run_id, created_at, added, removed, changed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (watch_id, run_id, time.time(), json.dumps(added), json.dumps(removed), json.dumps(changed))
+            )
+            self._conn.commit()
+
+    def changes(self, watch_id: Optional[int] = None, since: Optional[float] = None,
+                limit: int = 100) -> List[dict]:
+        """List recorded result changes for watched queries, newest first"""
+        clauses, params = [], []
+        if watch_id is not None:
+            clauses.append("c.watch_id = ?")
+            params.append(watch_id)
+        if since is not None:
+            clauses.append("c.created_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.*, w.query FROM watch_changes c JOIN watchlist w ON w.id = c.watch_id "
+                f"{where} ORDER BY c.created_at DESC LIMIT ?",
+                params
+            ).fetchall()
+        return [
+            {
+                "watch_id": row["watch_id"],
+                "query": row["query"],
+                "run_id": row["run_id"],
+                "created_at": row["created_at"],
+                "added": json.loads(row["added"]),
+                "removed": json.loads(row["removed"]),
+                "changed": json.loads(row["changed"]),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _row_to_run(row: sqlite3.Row, include_raw: bool) -> dict:
+        run = {
+            "id": row["id"],
+            "query": row["query"],
+            "mode": row["mode"],
+            "created_at": row["created_at"],
+            "summarized": row["summarized"],
+            "reused": row["reused"],
+            "data": json.loads(row["result"]),
+        }
+        if include_raw:
+            run["search_results"] = json.loads(row["search_results"])
+        return run
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> Optional[ResearchStore]:
+    """Return the shared research store, or None if persistence is disabled"""
+    global _store
+    if not RESEARCH_STORE_PATH:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResearchStore(RESEARCH_STORE_PATH, retention_seconds=RESEARCH_RETENTION_DAYS * 86400)
+        return _store
@@ -0,0 +1,32 @@
+"""
+Timing utility for the Research Assistant
+Collects per-stage durations of a research run for benchmarking
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+
+class StageTimer:
+    """Accumulates wall-clock time spent in named stages"""
+    
+    def __init__(self):
+        self.stages = {}
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block and add it to the stage's total"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+    
+    @property
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+
+def timed(timer: Optional[StageTimer], name: str):
+    """Context manager timing a stage if a timer was given, otherwise a no-op"""
+    return timer.stage(name) if timer is not None else nullcontext()